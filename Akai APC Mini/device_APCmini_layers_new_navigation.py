@@ -1,4 +1,5 @@
 # name=AKAI APC mini Proto Ale
+# receiveFrom=AKAI APC mini link
 # url=https://www.akaipro.com/apc-mini
 
 import device
@@ -11,9 +12,13 @@ import transport
 import general
 import ui
 
+import array
+import bisect
+import json
 import math
+import os
+import struct
 import time
-import inspect
 
 # ============================================================================
 # DEBUG CONFIGURATION
@@ -21,20 +26,336 @@ import inspect
 DEBUG = {
     'OnProjectLoad': False,
     'OnRefresh': True,
+    'refresh__service': False,
     'OnMidiMsg': True,
     'OnUpdateBeatIndicator': True,
     'set_state': False,
-    'patterns__update_pad': False,
     'patterns__get_data': False,
     'patterns__update_pads': False,
     'patterns__update_single_pad': False,
     'patterns__update_pads_playidx': True,
     'plugins__get_data': True,
-    'plugins__update_pads': True,
     'plugins__select_on_pad': True,
-    'plugins__set_par_val': True
+    'plugins__set_par_val': True,
+    'clips': False,
+    'input': False,
+    'faders': False,
+    'scheduler': False,
+    'time_signature': False
 }
 
+# "print" writes to FL's script console, "ring" keeps the last
+# DEBUG_RING_SIZE messages in memory until debug_dump() is called
+DEBUG_OUTPUT = "print"
+DEBUG_RING_SIZE = 512
+
+# Per-callback profiling (see profile__report). Resolved at load time:
+# when False, nothing is instrumented.
+PROFILE = False
+PROFILE_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 20)  # Latency histogram bounds
+
+# Trace recording for benchmarks/replay.py (see trace__install). Resolved
+# at load time like PROFILE.
+TRACE = False
+TRACE_PATH = "apcmini_trace.bin"  # Relative paths are resolved next to the script
+TRACE_FLUSH_BYTES = 65536  # Buffered trace size that triggers a write to disk
+
+# ============================================================================
+# DEBUG LOGGING
+# ============================================================================
+# Categories are resolved once, when the script loads. A disabled logger
+# returns before formatting its message; hot loops additionally test
+# `logger.on` so that not even the call and its arguments are evaluated.
+
+debug_ring = [None] * DEBUG_RING_SIZE
+debug_ring_count = 0  # Total messages written to the ring
+
+
+class DebugLog:
+    """Debug output for one DEBUG category."""
+    __slots__ = ("category", "on")
+    
+    def __init__(self, category):
+        self.category = category
+        self.on = DEBUG.get(category, False)
+    
+    def __call__(self, message, *args):
+        """Log message % args if the category is enabled."""
+        if self.on:
+            _debug_emit(self.category, message % args if args else message)
+
+
+def _debug_emit(category, message):
+    """Send a formatted message to the configured output."""
+    global debug_ring_count
+    
+    line = f"[{category}] {message}"
+    if DEBUG_OUTPUT == "ring":
+        debug_ring[debug_ring_count % DEBUG_RING_SIZE] = line
+        debug_ring_count += 1
+    else:
+        print(line)
+
+
+def debug_dump():
+    """Print and clear the messages held in the ring buffer."""
+    global debug_ring_count
+    
+    first = max(0, debug_ring_count - DEBUG_RING_SIZE)
+    if first:
+        print(f"({first} older debug messages dropped)")
+    for idx in range(first, debug_ring_count):
+        print(debug_ring[idx % DEBUG_RING_SIZE])
+    debug_ring_count = 0
+
+
+log_OnProjectLoad = DebugLog('OnProjectLoad')
+log_OnRefresh = DebugLog('OnRefresh')
+log_refresh__service = DebugLog('refresh__service')
+log_OnMidiMsg = DebugLog('OnMidiMsg')
+log_OnUpdateBeatIndicator = DebugLog('OnUpdateBeatIndicator')
+log_set_state = DebugLog('set_state')
+log_patterns__get_data = DebugLog('patterns__get_data')
+log_patterns__update_pads = DebugLog('patterns__update_pads')
+log_patterns__update_single_pad = DebugLog('patterns__update_single_pad')
+log_patterns__update_pads_playidx = DebugLog('patterns__update_pads_playidx')
+log_plugins__get_data = DebugLog('plugins__get_data')
+log_plugins__select_on_pad = DebugLog('plugins__select_on_pad')
+log_plugins__set_par_val = DebugLog('plugins__set_par_val')
+log_clips = DebugLog('clips')
+log_input = DebugLog('input')
+log_faders = DebugLog('faders')
+log_scheduler = DebugLog('scheduler')
+log_time_signature = DebugLog('time_signature')
+
+# ============================================================================
+# PROFILING
+# ============================================================================
+# With PROFILE enabled, the FL callbacks and refresh handlers are wrapped to
+# record call counts, a latency histogram and the FL API calls they make.
+# FL API calls are counted by replacing the imported FL modules with
+# counting proxies. Figures are inclusive: a refresh handler's cost also
+# shows up under OnIdle.
+
+FL_MODULE_NAMES = ("device", "channels", "playlist", "patterns", "mixer",
+                   "plugins", "transport", "general", "ui")
+PROFILED_CALLBACKS = ("OnInit", "OnDeInit", "OnProjectLoad", "OnRefresh", "OnIdle",
+                      "OnMidiMsg", "OnUpdateBeatIndicator", "OnUpdateLiveMode")
+profile_stats = {}  # name -> {"calls", "total", "max", "hist", "reads", "writes", "midi"}
+profile_counters = [0, 0, 0]  # FL API reads, FL API writes, MIDI messages sent
+
+
+class _CountingModule:
+    """Proxy for an FL module that counts the calls made through it."""
+    
+    def __init__(self, module):
+        self._module = module
+    
+    def __getattr__(self, name):
+        attr = getattr(self._module, name)
+        if callable(attr):
+            if name == "midiOutMsg":
+                counter = 2
+            elif name.startswith(("set", "start", "stop", "jump", "trigger", "dispatch")):
+                counter = 1
+            else:
+                counter = 0
+            attr = _counting_call(attr, counter)
+            setattr(self, name, attr)  # Later lookups skip __getattr__
+        return attr
+
+
+def _counting_call(func, counter):
+    """Wrap an FL API function so each call bumps profile_counters[counter]."""
+    def wrapper(*args, **kwargs):
+        profile_counters[counter] += 1
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def _profiled(name, func):
+    """Wrap func so its calls are recorded under name in profile_stats."""
+    stats = profile_stats.setdefault(name, {
+        "calls": 0, "total": 0.0, "max": 0.0,
+        "hist": [0] * (len(PROFILE_BUCKETS_MS) + 1),
+        "reads": 0, "writes": 0, "midi": 0
+    })
+    
+    def wrapper(*args):
+        reads, writes, midi = profile_counters
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        stats["calls"] += 1
+        stats["total"] += elapsed_ms
+        stats["max"] = max(stats["max"], elapsed_ms)
+        bucket = 0
+        while bucket < len(PROFILE_BUCKETS_MS) and elapsed_ms >= PROFILE_BUCKETS_MS[bucket]:
+            bucket += 1
+        stats["hist"][bucket] += 1
+        stats["reads"] += profile_counters[0] - reads
+        stats["writes"] += profile_counters[1] - writes
+        stats["midi"] += profile_counters[2] - midi
+        return result
+    
+    wrapper.__name__ = func.__name__
+    return wrapper
+
+
+def profile__install():
+    """Instrument the FL modules and callbacks. Called once at load time."""
+    script_globals = globals()
+    for module_name in FL_MODULE_NAMES:
+        script_globals[module_name] = _CountingModule(script_globals[module_name])
+    for name in PROFILED_CALLBACKS:
+        script_globals[name] = _profiled(name, script_globals[name])
+
+
+def profile__report():
+    """Print the per-callback and per-handler profile."""
+    if not PROFILE:
+        print("Profiling is disabled (set PROFILE = True)")
+        return
+    
+    bounds = " ".join(f"<{bound}" for bound in PROFILE_BUCKETS_MS)
+    print(f"Profile (inclusive, histogram ms: {bounds} >=)")
+    for name, stats in profile_stats.items():
+        calls = stats["calls"]
+        if not calls:
+            continue
+        print(f"  {name}: {calls} calls, avg {stats['total'] / calls:.3f} ms, "
+              f"max {stats['max']:.3f} ms, FL reads {stats['reads']}, "
+              f"FL writes {stats['writes']}, MIDI out {stats['midi']}, "
+              f"hist {stats['hist']}")
+
+
+# ============================================================================
+# TRACE RECORDING
+# ============================================================================
+# With TRACE enabled, every callback and every value the FL API returns to
+# the script is appended to a binary trace, which benchmarks/replay.py feeds
+# back through the script. Layout (little endian):
+#   header  b"APCT", u16 TRACE_VERSION
+#   record  u8 kind, u32 microseconds since the previous record, payload
+# Callback payloads are given by TRACE_CALLBACKS. An FL function is named
+# once by a TRACE_NAME record (u16 id, u8 length, "module.function") before
+# its first TRACE_RETURN record (u16 id, u8 type tag, value). None results
+# and values of other types are not recorded.
+
+TRACE_VERSION = 1
+TRACE_NAME = 16
+TRACE_RETURN = 17
+TRACE_CALLBACKS = {  # Callback -> (kind, payload struct format)
+    "OnInit": (1, ""),
+    "OnDeInit": (2, ""),
+    "OnProjectLoad": (3, "i"),
+    "OnRefresh": (4, "I"),
+    "OnIdle": (5, ""),
+    "OnMidiMsg": (6, "BBB"),
+    "OnUpdateBeatIndicator": (7, "B"),
+    "OnUpdateLiveMode": (8, "i")
+}
+TRACE_VALUE_FORMATS = ((bool, 1, "?"), (int, 2, "q"), (float, 3, "d"), (str, 4, "H"))  # type, tag, format
+
+trace_buffer = bytearray()
+trace_names = {}  # "module.function" -> id
+trace_clock = [0.0]  # perf_counter of the last record
+
+
+class _TracingModule:
+    """Proxy for an FL module that records the values its calls return."""
+    
+    def __init__(self, module, module_name):
+        self._module = module
+        self._module_name = module_name
+    
+    def __getattr__(self, name):
+        attr = getattr(self._module, name)
+        if callable(attr):
+            attr = _tracing_call(attr, f"{self._module_name}.{name}")
+            setattr(self, name, attr)  # Later lookups skip __getattr__
+        return attr
+
+
+def _tracing_call(func, name):
+    """Wrap an FL API function so its results are written to the trace."""
+    def wrapper(*args, **kwargs):
+        result = func(*args, **kwargs)
+        if result is not None:
+            _trace__return(name, result)
+        return result
+    return wrapper
+
+
+def _trace__record(kind, fmt, *values):
+    """Append one record to the trace buffer."""
+    now = time.perf_counter()
+    delta = min(max(int((now - trace_clock[0]) * 1000000), 0), 0xFFFFFFFF)
+    trace_clock[0] = now
+    trace_buffer.extend(struct.pack("<BI" + fmt, kind, delta, *values))
+
+
+def _trace__return(name, value):
+    """Append a TRACE_RETURN record, naming the function first if needed."""
+    for value_type, tag, fmt in TRACE_VALUE_FORMATS:
+        if isinstance(value, value_type):
+            break
+    else:
+        return
+    
+    function_id = trace_names.get(name)
+    if function_id is None:
+        function_id = trace_names[name] = len(trace_names)
+        encoded = name.encode()
+        _trace__record(TRACE_NAME, f"HB{len(encoded)}s", function_id, len(encoded), encoded)
+    
+    if tag == 4:
+        encoded = value.encode()[:0xFFFF]
+        _trace__record(TRACE_RETURN, f"HBH{len(encoded)}s", function_id, tag, len(encoded), encoded)
+    else:
+        _trace__record(TRACE_RETURN, "HB" + fmt, function_id, tag, value)
+
+
+def _traced(name, func):
+    """Wrap callback func so each call is recorded before it runs."""
+    kind, fmt = TRACE_CALLBACKS[name]
+    
+    def wrapper(*args):
+        if name == "OnMidiMsg":
+            event = args[0]
+            _trace__record(kind, fmt, event.status & 0xFF, event.data1 & 0xFF, event.data2 & 0xFF)
+        else:
+            _trace__record(kind, fmt, *args)
+        result = func(*args)
+        if name == "OnDeInit" or len(trace_buffer) >= TRACE_FLUSH_BYTES:
+            trace__flush()
+        return result
+    
+    wrapper.__name__ = func.__name__
+    return wrapper
+
+
+def trace__install():
+    """Start a new trace file and instrument the FL modules and callbacks."""
+    with open(_script_relative_path(TRACE_PATH), "wb") as trace_file:
+        trace_file.write(b"APCT" + struct.pack("<H", TRACE_VERSION))
+    trace_clock[0] = time.perf_counter()
+    
+    script_globals = globals()
+    for module_name in FL_MODULE_NAMES:
+        script_globals[module_name] = _TracingModule(script_globals[module_name], module_name)
+    for name in TRACE_CALLBACKS:
+        script_globals[name] = _traced(name, script_globals[name])
+
+
+def trace__flush():
+    """Append the buffered records to the trace file."""
+    with open(_script_relative_path(TRACE_PATH), "ab") as trace_file:
+        trace_file.write(trace_buffer)
+    del trace_buffer[:]
+
+
 # ============================================================================
 # LED COLOR CONSTANTS (velocity values for Note On messages)
 # ============================================================================
@@ -68,6 +389,10 @@ BT_PAN = 69
 BT_SEND = 70
 BT_DEVICE = 71
 
+# Held to reach hidden functions (SHIFT + STOP: profiling report,
+# SHIFT + STATE: dump debug ring)
+BT_SHIFT = 98
+
 # ============================================================================
 # PAD GRID CONSTANTS
 # ============================================================================
@@ -84,6 +409,16 @@ PAD_PATTERN_SEPARATOR_END = 15
 PAD_PAGE_NAVIGATION_START = 0
 PAD_PAGE_NAVIGATION_END = 7
 
+# Multi-unit: UNITS APC minis tiled left to right as one logical grid. Unit
+# 0 is the controller this script is bound to; each further unit runs
+# device_APCmini_link.py and is reached through device.dispatch (receiver
+# unit - 1). Renderers address logical notes: unit * UNIT_NOTES + note.
+UNITS = 1
+UNIT_NOTES = 128
+GRID_WIDTH = PAD_GRID_SIZE_X * UNITS  # Pad columns across all units
+LINK_CHANNEL = 15  # MIDI channel of messages to the link scripts
+LINK_HELLO_CC = 127  # CC telling a link script its unit number
+
 # ============================================================================
 # FADER CONSTANTS
 # ============================================================================
@@ -95,65 +430,319 @@ N_FADERS = 8
 # ============================================================================
 # CONTROLLER STATES
 # ============================================================================
-STATES = ["DEFAULT", "PATTERNS", "PLUGINS", "PLACEHOLDER"]
+STATES = ["DEFAULT", "PATTERNS", "PLUGINS", "CLIPS", "METERS"]
 FADER_MODES = ["VOLUME", "PAN", "SEND", "DEVICE"]
 
 # ============================================================================
-# FL STUDIO REFRESH FLAGS (for reference)
+# FL STUDIO REFRESH FLAGS
+# ============================================================================
+HW_Dirty_Mixer_Sel = 1              # Mixer selection changed
+HW_Dirty_Mixer_Display = 2          # Mixer display changed
+HW_Dirty_Mixer_Controls = 4         # Mixer controls changed
+HW_Dirty_RemoteLinks = 16           # Remote links added/removed
+HW_Dirty_FocusedWindow = 32         # Channel selection changed
+HW_Dirty_Performance = 64           # Performance layout changed
+HW_Dirty_LEDs = 256                 # LED updates required
+HW_Dirty_RemoteLinkValues = 512     # Remote link value changed
+HW_Dirty_Patterns = 1024            # Pattern changes
+HW_Dirty_Tracks = 2048              # Track changes
+HW_Dirty_ControlValues = 4096       # Plugin control value changes
+HW_Dirty_Colors = 8192              # Plugin colors changes
+HW_Dirty_Names = 16384              # Plugin names changes
+HW_Dirty_ChannelRackGroup = 32768   # Channel rack group changes
+HW_ChannelEvent = 65536             # Channel changes
+
+# Dispatcher masks
+REFRESH_ANY = ~0
+FLAGS_PATTERNS = HW_Dirty_Patterns | HW_Dirty_Tracks | HW_Dirty_ChannelRackGroup
+FLAGS_PLUGINS = HW_Dirty_Colors | HW_Dirty_Names
+
 # ============================================================================
-ONREFRESH_FLAGS = [
-    "HW_Dirty_Mixer_Sel",           # 1 - Mixer selection changed
-    "HW_Dirty_Mixer_Display",       # 2 - Mixer display changed
-    "HW_Dirty_Mixer_Controls",      # 4 - Mixer controls changed
-    "HW_Dirty_Mixer_Controls",      # 8 - (duplicate)
-    "HW_Dirty_RemoteLinks",         # 16 - Remote links added/removed
-    "HW_Dirty_FocusedWindow",       # 32 - Channel selection changed
-    "HW_Dirty_Performance",         # 64 - Performance layout changed
-    "HW_Dirty_LEDs",                # 256 - LED updates required
-    "HW_Dirty_RemoteLinkValues",    # 512 - Remote link value changed
-    "HW_Dirty_Patterns",            # 1024 - Pattern changes
-    "HW_Dirty_Tracks",              # 2048 - Track changes
-    "HW_Dirty_ControlValues",       # 4096 - Plugin control value changes
-    "HW_Dirty_Colors",              # 8192 - Plugin colors changes
-    "HW_Dirty_Names",               # 16384 - Plugin names changes
-    "HW_Dirty_ChannelRackGroup",    # 32768 - Channel rack group changes
-    "HW_ChannelEvent"               # 65536 - Channel changes
-]
+# DATA MODEL
+# ============================================================================
+BLOCK_MASK = (1 << PAD_GRID_SIZE_X) - 1  # One 8-step block
+PAGE_MASK = (1 << GRID_WIDTH) - 1  # One page, as wide as the logical grid
+
+
+class PatternGrid:
+    """Step data of one pattern, stored as one bit-packed int per channel.
+    
+    Bit i of bits[channel] is set when step i is on, and bit i of
+    valid[channel] when step i holds data read from FL. stale[channel]
+    marks the 8-step blocks that must be re-read.
+    """
+    __slots__ = ("length", "bits", "valid", "stale")
+    
+    def __init__(self, n_channels, length):
+        self.length = length
+        self.bits = [0] * n_channels
+        self.valid = [0] * n_channels
+        self.stale = [0] * n_channels
+    
+    def __len__(self):
+        return len(self.bits)
+    
+    def get(self, channel, step):
+        """Return 1/0 for a loaded step, -1 if it holds no data."""
+        if not self.valid[channel] >> step & 1:
+            return -1
+        return self.bits[channel] >> step & 1
+    
+    def set(self, channel, step, value):
+        """Store a single step."""
+        bit = 1 << step
+        self.valid[channel] |= bit
+        if value:
+            self.bits[channel] |= bit
+        else:
+            self.bits[channel] &= ~bit
+    
+    def set_block(self, channel, block, on, valid):
+        """Store an 8-step block given as on/valid bitmasks."""
+        shift = block * PAD_GRID_SIZE_X
+        keep = ~(BLOCK_MASK << shift)
+        self.bits[channel] = (self.bits[channel] & keep) | (on << shift)
+        self.valid[channel] = (self.valid[channel] & keep) | (valid << shift)
+    
+    def resize(self, length):
+        """Change the pattern length, dropping steps beyond it."""
+        mask = (1 << length) - 1
+        self.bits = [bits & mask for bits in self.bits]
+        self.valid = [valid & mask for valid in self.valid]
+        self.length = length
+    
+    def page_view(self, page, first, n_rows):
+        """Return an (on, valid) pair of GRID_WIDTH-step bitmasks per row for one page.
+        
+        Rows are the channels first .. first + n_rows - 1 that exist.
+        """
+        shift = page * GRID_WIDTH
+        return tuple(
+            ((self.bits[channel] >> shift) & PAGE_MASK, (self.valid[channel] >> shift) & PAGE_MASK)
+            for channel in range(first, min(first + n_rows, len(self.bits)))
+        )
+    
+    def column_view(self, step, first, n_rows):
+        """Return (on, valid) bitmasks over n_rows channels from first for one step."""
+        on = 0
+        valid = 0
+        for row in range(min(n_rows, len(self.bits) - first)):
+            if self.valid[first + row] >> step & 1:
+                valid |= 1 << row
+                on |= (self.bits[first + row] >> step & 1) << row
+        return on, valid
+
+
+class PluginDescriptor:
+    """Parameter names of one plugin type, shared by all its instances.
+    
+    Instances are matched on (plugin name, parameter count), see
+    plugins__descriptor. names[par] is None until read from FL. Bit par of
+    cached is set for a name read from the descriptor cache; those are
+    trusted once one of them has been checked against FL (cached is 0).
+    """
+    __slots__ = ("name", "n_pars", "names", "cached")
+    
+    def __init__(self, name, n_pars, names=None, cached=0):
+        self.name = name
+        self.n_pars = n_pars
+        self.names = names if names is not None else [None] * n_pars
+        self.cached = cached
+
+
+class SlotRecord:
+    """One mixer slot of the rack mirror.
+    
+    name is None for an empty slot. descriptor and values are attached when
+    the plugin is first opened; bit par of loaded is set once values[par]
+    holds data read from FL.
+    """
+    __slots__ = ("name", "descriptor", "values", "loaded")
+    
+    def __init__(self, name):
+        self.name = name
+        self.descriptor = None
+        self.values = None
+        self.loaded = 0
+    
+    def attach(self, descriptor):
+        """Use descriptor for this slot and allocate its parameter values."""
+        self.descriptor = descriptor
+        self.values = array.array("d", bytes(8 * descriptor.n_pars))
+        self.loaded = 0
+    
+    def n_pars(self):
+        """Return the parameter count, 0 while it has not been read."""
+        return self.descriptor.n_pars if self.descriptor is not None else 0
+
+
+EMPTY_SLOT = SlotRecord(None)  # Shared by all empty slots, never attached
+
+
+class TrackRecord:
+    """One mixer track of the rack mirror: its name and SlotRecord per slot."""
+    __slots__ = ("name", "slots")
+    
+    def __init__(self, name, slots):
+        self.name = name
+        self.slots = slots
+
+
+class ClipTrackRecord:
+    """Live block occupancy of one playlist track, as bitmasks over blocks.
+    
+    Bit b of filled is set when block b holds a clip, and of playing when
+    that clip plays (or is queued). Both only hold data where bit b of
+    loaded is set.
+    """
+    __slots__ = ("filled", "playing", "loaded")
+    
+    def __init__(self):
+        self.filled = 0
+        self.playing = 0
+        self.loaded = 0
 
-# Plugin-related flags (from empirical testing)
-FLAGS_PLUGINS = (17703, 'HW_Dirty_Colors', 'HW_Dirty_Names')
 
 # ============================================================================
 # GLOBAL STATE VARIABLES
 # ============================================================================
 current_state_index = 0
 current_fader_mode_index = 0
+shift_held = False
+
+# Fader input, coalesced per idle tick (see faders__apply_pending)
+FADER_PICKUP = False  # Soft takeover: a fader must reach the target's value first
+FADER_PICKUP_TOLERANCE = 1 / 64
+fader_pending = {}  # CC number -> latest value received since the last idle tick
+fader_written = {}  # (setter, index) -> last value written to FL
+fader_pickup_last = {}  # (setter, index) -> fader value seen while not picked up
+fader_picked_up = set()  # (setter, index) targets the fader has caught
+
+# Input routing: (status, data1) -> (handler, args), see input__build_routes
+input_routes = {}
+input_shift_routes = {}
 
 # Playback state
 playing = 0
 playing_his = 0
 
 # Timing
-BEATS_PER_PAGE = int((1/4) * PAD_GRID_SIZE_X)
+BEATS_PER_PAGE = int((1/4) * GRID_WIDTH)
 bar_cnt = 0
 beat_cnt = 0
 on_beat = False
+ticks_per_step = 24  # PPQ / 4, refreshed on init and when playback starts
+
+# Playhead: "SONGPOS" follows the transport position on idle ticks at 16th
+# step resolution; "BEAT" redraws from the beat indicator counters
+PLAYHEAD_MODE = "SONGPOS"
+SONGLENGTH_ABSTICKS = 2  # transport.getSongPos mode returning absolute ticks
+playhead_step = -1  # Step currently highlighted by the SONGPOS playhead
 
 # Pattern data
 pattern_length = PAD_GRID_SIZE_X * 2
-grid_data = []
+grid_data = PatternGrid(0, pattern_length)
+pattern_row_colours = {}  # (on, valid) page row bitmasks -> per unit, list of 8 LED colours
+grid_pattern = None  # Pattern number grid_data belongs to
+refresh_pattern = None  # Pattern active at the last HW_Dirty_Patterns refresh, see OnRefresh
+patterns_edited = set()  # Patterns refreshed while already active since the last service
+grid_cache = {}  # Pattern number -> (pattern name, PatternGrid), least recently used first
+GRID_CACHE_MAX_STEPS = 64 * 64 * 32  # Channel-steps kept across cached patterns
+grid_pending = False  # True while stale blocks remain to be loaded lazily
+PATTERNS_PREFETCH_WINDOWS = 1  # Channel windows above and below the view loaded on idle
+PATTERNS_FETCH_BUDGET = 16  # Stale blocks loaded per idle tick
+PATTERNS_VERIFY_FETCH = False  # Check incremental fetches against a full fetch
 pattern_follow_playindex = True
 
 # Plugin data
 MAX_PLUGINS_PER_TRACK = 10
-tracks_data = {}
+PLUGIN_PARS_PER_PAGE = PAD_GRID_SIZE_X * 2  # Two blocks of (name, +, -) rows
+PLUGINS_TRACKS_PER_PAGE = 4  # Tracks shown on the rack view, two pad rows each
+PLUGIN_PAR_STEP = 0.05  # Parameter change per +/- press
+PLUGIN_PAR_REPEAT_DELAY = 0.4  # Seconds a +/- pad is held before it repeats
+PLUGIN_PAR_REPEAT_INTERVAL = 0.08  # Seconds between repeats
+PLUGIN_PAR_REPEAT_ACCEL = 1.25  # Step growth per repeat
+PLUGIN_PAR_STEP_MAX = 0.25  # Largest step reached while repeating
+plugin_par_echo = 0  # Bits of open plugin parameters written since the last value refresh
+plugin_par_repeating = None  # (parameter offset, op) of the held +/- pad owning the repeat
+PLUGINS_CRAWL_BUDGET = 0.002  # Seconds of rack scanning per idle tick
+tracks_data = []  # TrackRecord per mixer track, None until crawled
+plugin_descriptors = {}  # (plugin name, parameter count) -> PluginDescriptor
+DESCRIPTOR_CACHE_PATH = "apcmini_descriptors.json"  # Next to the script if relative; None disables
+DESCRIPTOR_CACHE_VERSION = 1
+DESCRIPTOR_SAVE_DELAY = 5.0  # Seconds after learning new names before the cache is written
+descriptor_cache_loaded = False  # Cache file read (lazily, by the first plugins__descriptor call)
+descriptor_cache_dirty = False  # Names learned since the cache was last written
 plugins_pads_v_ofst = 0
+plugins_track_count = 0  # Mixer track count of the current (or last) crawl
+plugins_crawler = None  # Generator scanning the rack, see _plugins__crawl
+rack_valid = False  # True once a crawl completed with no invalidation since
 plugin_view = False
 selected_plugin = []
+device_fader_block = 0  # Block (row of 8) of the shown parameter page on the faders
+device_fader_pars = [None] * N_FADERS  # (track, slot, parameter) per fader in DEVICE mode
+
+# Clip launcher data (performance mode live blocks of the playlist)
+CLIP_BLOCKS = 64  # Live blocks reachable by scrolling right
+LIVE_STATUS_SIMPLE = 1  # playlist.getLiveBlockStatus mode: 0 empty, 1 filled, 2+ playing/queued
+TLC_MUTE_OTHERS = 1  # playlist.triggerLiveClip flags (midi.TLC_*)
+TLC_FILL = 2
+clip_tracks = []  # ClipTrackRecord per playlist track, index 0 is track 1
+clips_track_ofst = 0  # Index of the playlist track on the top pad row
+clips_block_ofst = 0  # Live block on the leftmost pad column
+
+# Peak meters (METERS state), one pad column per fader of the SEND bank
+METER_POLL_INTERVAL = 0.05  # Seconds between peak reads
+METER_PEAK_MODE = 2  # mixer.getTrackPeaks mode: the louder of left and right
+METER_FLOOR_DB = -48.0  # Level lighting the bottom pad; the top pad lights at 0 dB
+METER_DECAY = 16.0  # Pads per second a falling meter drops by
+METER_HOLD_TIME = 1.0  # Seconds a peak stays lit above a falling meter
+METER_STEP_LEVELS = tuple(  # Peak lighting each pad, bottom to top
+    10 ** (METER_FLOOR_DB * (1 - step / (PAD_GRID_SIZE_X - 1)) / 20) for step in range(PAD_GRID_SIZE_X)
+)
+METER_COLOURS = (LED_GREEN,) * 5 + (LED_YELLOW,) * 2 + (LED_RED,)  # Per pad, bottom to top
+meter_levels = [0.0] * N_FADERS  # Shown level in pads, decaying between peaks
+meter_holds = [0] * N_FADERS  # Held peak in pads
+meter_hold_until = [0.0] * N_FADERS
+meter_drawn = [None] * N_FADERS  # (lit pads, held pad) drawn per column
+meter_polled = 0.0  # perf_counter of the last poll
+
+# Refresh dispatcher
+refresh_handlers = []  # (mask, handler) pairs, serviced in registration order
+refresh_pending = 0  # Dirty bits OR-ed together since the last idle tick
+
+# Layer snapshots: the frame a layer showed when it was left, restored on
+# return while no dirty flag in its mask has been serviced since
+LAYER_DIRTY_MASKS = {
+    "DEFAULT": 0,
+    "PATTERNS": FLAGS_PATTERNS,
+    "PLUGINS": FLAGS_PLUGINS | HW_Dirty_Mixer_Display,
+    "CLIPS": HW_Dirty_Performance | HW_Dirty_Tracks,  # Also bumped by OnUpdateLiveMode
+    "METERS": 0  # Never saved: meters are redrawn from live peaks
+}
+layer_generation = {state: 0 for state in STATES}  # Bumped per serviced dirty flag in the mask
+layer_snapshots = {}  # State -> (generation, per unit LEDs PAD_START .. BT_RIGHT)
+
+# Deferred tasks (run from OnIdle, see scheduler__run)
+SETTLE_DELAY = 0.1  # Seconds to let the controller settle before a full redraw
+scheduler_tasks = []
+scheduler_stats = {"runs": 0, "late_total": 0.0, "late_max": 0.0}
+
+# LED framebuffer (indexed by logical note number, see UNITS)
+LED_NOTE_COUNT = UNIT_NOTES * UNITS
+led_front = [None] * LED_NOTE_COUNT  # Last colour sent to the controllers (None = unknown)
+led_back = [LED_OFF] * LED_NOTE_COUNT  # Colour drawn by the renderers
+LED_PRIO_PLAYHEAD = 0  # Output priorities, most urgent first: follows time (playhead, meters)
+LED_PRIO_FEEDBACK = 1  # Answers a pad or button press
+LED_PRIO_BACKGROUND = 2  # Repaints
+LED_FLUSH_BUDGET = 40  # Messages per unit per flush; the rest waits for the next one
+led_queues = [[set(), set(), set()] for _ in range(UNITS)]  # Per unit, per priority: notes to send
+led_queued = [None] * LED_NOTE_COUNT  # Priority each note is queued at, None if not queued
 
 # Navigation state
 navigation = {
     "PATTERNS": {"current_page": 0, "pages": 0},
+    "CHANNELS": {"current_page": 0, "pages": 0},
     "TRACKS": {"current_page": 0, "pages": 0},
     "PLUGIN_PARS": {"current_page": 0, "pages": 0}
 }
@@ -165,6 +754,7 @@ navigation = {
 def OnInit():
     """Called when script is loaded."""
     init()
+    leds__flush()
     print('AKAI APC mini initialized')
     print(f'Current State: {STATES[current_state_index]}')
 
@@ -174,12 +764,24 @@ def OnDeInit():
     print('AKAI APC mini deinitialized')
     
     # Turn off all pad LEDs
-    for note in range(PAD_START, PAD_END + 1):
-        device.midiOutMsg(144, 0, note, LED_OFF)
+    for note in _unit_notes(PAD_START, PAD_END):
+        leds__set(note, LED_OFF)
     
     # Turn off all button LEDs
     for note in range(BT_UP, BT_DEVICE + 1):
-        device.midiOutMsg(144, 0, note, LED_OFF)
+        leds__set(note, LED_OFF)
+    
+    # Hardware state may have drifted, so resend everything, past the budget
+    leds__invalidate()
+    leds__flush(LED_NOTE_COUNT)
+    
+    if descriptor_cache_dirty:
+        plugins__save_descriptor_cache()
+    
+    if DEBUG_OUTPUT == "ring":
+        debug_dump()
+    if PROFILE:
+        profile__report()
 
 
 def OnProjectLoad(status):
@@ -190,100 +792,111 @@ def OnProjectLoad(status):
         init()
         beat_cnt = 0
         bar_cnt = 0
+        leds__flush()
         print('AKAI APC mini re-initialized')
         print(f'Current State: {STATES[current_state_index]}')
 
 
 def OnRefresh(flag):
-    """Called when something changed that the script might want to respond to."""
-    global playing, playing_his, beat_cnt, bar_cnt, pattern_follow_playindex
+    """Called when something changed that the script might want to respond to.
     
-    debug_print(f'flag: {flag}')
-    current_state = STATES[current_state_index]
+    FL fires refreshes in bursts while a project is edited, so the dirty bits
+    are only accumulated here and serviced once on the next idle tick.
     
-    # Parse flags (each flag is a power of 2)
-    found_flags = _parse_flags(flag)
+    Pattern refreshes are told apart here, before coalescing hides their
+    order: the first after a switch is the switch, later ones while the
+    same pattern is active are edits of it.
+    """
+    global refresh_pending, refresh_pattern
     
-    # Update time signature
-    _update_time_signature()
-    
-    # Check if patterns or tracks were modified
-    if "HW_Dirty_Patterns" in found_flags or "HW_Dirty_Tracks" in found_flags:
-        debug_print("Pattern or track modification detected")
-        patterns__get_data()
-        if current_state == "PATTERNS":
-            patterns__update_pads("all")
+    log_OnRefresh('flag: %s', flag)
+    refresh_pending |= flag
+    if flag & HW_Dirty_Patterns:
+        pattern_number = patterns.patternNumber()
+        if pattern_number == refresh_pattern:
+            patterns_edited.add(pattern_number)
+        refresh_pattern = pattern_number
+
+
+def OnIdle():
+    """Called periodically by FL Studio (roughly every 20 ms)."""
+    refresh__service()
+    scheduler__run()
+    if fader_pending:
+        faders__apply_pending()
     
-    # Check playback state changes
-    playing = transport.isPlaying()
-    if playing_his != playing:
-        debug_print(f'Playback state changed: {playing}')
-        playing_his = playing
+    if STATES[current_state_index] == "PATTERNS":
+        if PLAYHEAD_MODE == "SONGPOS" and playing:
+            patterns__update_playhead()
         
-        if not playing:
-            beat_cnt = 0
-            bar_cnt = 0
-            if current_state == "PATTERNS":
-                pattern_follow_playindex = True
-                patterns__update_pads("all")
+        # Load pattern data that is not on screen yet
+        if grid_pending:
+            patterns__fetch_pending(PATTERNS_FETCH_BUDGET)
     
-    # Check for plugin modifications
-    if flag in FLAGS_PLUGINS or any(f in found_flags for f in FLAGS_PLUGINS):
-        plugins__get_data()
-        if current_state == "PLUGINS" and not plugin_view:
-            plugins__display_on_pads()
+    elif STATES[current_state_index] == "PLUGINS" and plugins_crawler is not None:
+        plugins__crawl_pending(PLUGINS_CRAWL_BUDGET)
+    
+    elif STATES[current_state_index] == "METERS" and not scheduler__pending("set_state"):
+        meters__poll()
+    
+    leds__flush()
 
 
 def OnMidiMsg(event):
-    """Main MIDI message handler."""
-    global current_state_index, current_fader_mode_index
-    global plugin_view, pattern_follow_playindex
+    """Main MIDI message handler.
     
+    Messages are routed through input_routes, which input__build_routes()
+    precompiles for the current state and sub-view.
+    """
     event.handled = False
-    current_state = STATES[current_state_index]
     
-    # ========================================================================
-    # NOTE ON MESSAGES (Buttons and Pads)
-    # ========================================================================
-    if event.status == 144 and event.data2 > 0:
-        debug_print(f'Note On: {event.data1}')
-        
-        # State change button
-        if event.data1 == BT_STATE:
-            current_state_index = (current_state_index + 1) % len(STATES)
-            debug_print(f'State changed to: {STATES[current_state_index]}')
-            set_state()
-        
-        # Fader mode buttons
-        elif event.data1 in range(BT_VOL, BT_DEVICE + 1):
-            current_fader_mode_index = event.data1 - BT_VOL
-            _update_fader_button_leds(event.data1)
-            debug_print(f'Fader mode: {FADER_MODES[current_fader_mode_index]}')
-        
-        # Transport controls
-        elif event.data1 == BT_PLAY:
-            transport.start()
-        elif event.data1 == BT_STOP:
-            transport.stop()
-        
-        # State-specific pad handlers
-        else:
-            _handle_state_specific_input(event.data1, current_state)
+    # Linked units send on their unit number's channel (see UNITS)
+    status = event.status & 0xF0
+    unit = event.status & 0x0F
+    if unit >= UNITS:
+        return
+    if status == 144 and event.data2 == 0:
+        status = 128  # Note On with velocity 0 is a release
+    key = (status, unit * UNIT_NOTES + event.data1)
+    
+    if status == 144:
+        log_OnMidiMsg('Note On: %s', event.data1)
+    
+    route = input_shift_routes.get(key) if shift_held else None
+    if route is None:
+        route = input_routes.get(key)
     
-    # ========================================================================
-    # CC MESSAGES (Faders)
-    # ========================================================================
-    elif event.status == 176:
-        _handle_fader_input(event.data1, event.data2)
+    if route is not None:
+        handler, args = route
+        if status == 176:
+            handler(*args, event.data2)  # Faders also receive their value
+        else:
+            handler(*args)
     
+    leds__flush()
     event.handled = True
 
 
+def OnUpdateLiveMode(last_track):
+    """Called when live blocks changed. FL reports the tracks 1 .. last_track."""
+    log_clips("Live mode update up to track %s", last_track)
+    clips__invalidate(0, last_track - 1)
+    layer_generation["CLIPS"] += 1
+    if STATES[current_state_index] == "CLIPS" and not scheduler__pending("set_state"):
+        scheduler__after(0, _clips__redraw, key="clips_redraw")  # Coalesces bursts
+
+
 def OnUpdateBeatIndicator(val):
-    """Called when the beat indicator changes (0=off, 1=bar, 2=beat)."""
+    """Called when the beat indicator changes (0=off, 1=bar, 2=beat).
+    
+    The beat and bar counters only drive the "BEAT" playhead; the SONGPOS
+    playhead follows the transport from OnIdle.
+    """
     global bar_cnt, beat_cnt, on_beat
     
-    debug_print(f'Beat indicator: {val}')
+    log_OnUpdateBeatIndicator('Beat indicator: %s', val)
+    if PLAYHEAD_MODE != "BEAT":
+        return
     
     if val != 0:  # On beat
         on_beat = True
@@ -299,11 +912,13 @@ def OnUpdateBeatIndicator(val):
     else:
         on_beat = False
     
-    debug_print(f'Bar: {bar_cnt}, Beat: {beat_cnt}')
+    log_OnUpdateBeatIndicator('Bar: %s, Beat: %s', bar_cnt, beat_cnt)
     
     # Update playback indicator in pattern mode
     if STATES[current_state_index] == "PATTERNS":
         patterns__update_pads_playidx()
+    
+    leds__flush()
 
 
 # ============================================================================
@@ -314,56 +929,310 @@ def set_state():
     """Update all pad LEDs and buttons based on current state."""
     global plugin_view
     
-    reset_pads_grid()
     plugin_view = False  # Reset plugin view when changing states
+    scheduler__cancel("set_state")  # Drop a redraw queued for a previous state
+    scheduler__cancel("par_repeat")  # A held +/- pad loses its release route
+    input__build_routes()
     
     current_state = STATES[current_state_index]
-    debug_print(f"Setting state: {current_state}")
+    log_set_state("Setting state: %s", current_state)
     
+    if layers__restore(current_state):
+        return
+    
+    # Data is queried right away so input works immediately; the redraw
+    # waits for the controller to settle without blocking FL's thread
     if current_state == "DEFAULT":
+        reset_pads_grid()
         _set_default_state()
     elif current_state == "PATTERNS":
         patterns__get_data()
-        time.sleep(0.1)
-        patterns__update_pads("all")
+        scheduler__after(SETTLE_DELAY, _draw_patterns_state, key="set_state")
     elif current_state == "PLUGINS":
         plugins__get_data()
-        time.sleep(0.1)
-        plugins__display_on_pads()
-    elif current_state == "PLACEHOLDER":
-        _set_placeholder_state()
+        scheduler__after(SETTLE_DELAY, _draw_plugins_state, key="set_state")
+    elif current_state == "CLIPS":
+        clips__get_data()
+        scheduler__after(SETTLE_DELAY, _draw_clips_state, key="set_state")
+    elif current_state == "METERS":
+        meters__reset()
+        scheduler__after(SETTLE_DELAY, _draw_meters_state, key="set_state")
+
+
+def layers__save():
+    """Keep the frame of the current layer for when it is shown again.
+    
+    Nothing is kept while the layer's redraw is still queued, in plugin view
+    (set_state always returns to the rack), while the rack is being crawled
+    or for METERS.
+    """
+    state = STATES[current_state_index]
+    if (scheduler__pending("set_state") or plugin_view or state == "METERS"
+            or (state == "PLUGINS" and not rack_valid)):
+        layer_snapshots.pop(state, None)
+        return
+    frame = [led_back[unit * UNIT_NOTES + PAD_START:unit * UNIT_NOTES + BT_RIGHT + 1] for unit in range(UNITS)]
+    layer_snapshots[state] = (layer_generation[state], frame)
+
+
+def layers__restore(state):
+    """Draw the saved frame of a layer if still valid. Returns True if restored.
+    
+    A snapshot is used once: while the layer is shown, its navigation may
+    move on.
+    """
+    snapshot = layer_snapshots.pop(state, None)
+    if snapshot is None or snapshot[0] != layer_generation[state]:
+        return False
+    log_set_state("Restoring cached %s frame", state)
+    for unit, colours in enumerate(snapshot[1]):
+        leds__set_row(unit * UNIT_NOTES + PAD_START, colours)
+    return True
+
+
+def _draw_patterns_state():
+    """Deferred full redraw after entering PATTERNS state."""
+    reset_pads_grid()
+    patterns__update_pads("all")
+
+
+def _draw_plugins_state():
+    """Deferred full redraw after entering PLUGINS state."""
+    reset_pads_grid()
+    reset_arrow_buttons()
+    plugins__display_on_pads()
+
+
+def _draw_clips_state():
+    """Deferred full redraw after entering CLIPS state."""
+    reset_arrow_buttons()
+    clips__display_on_pads()
+
+
+def _draw_meters_state():
+    """Deferred clear after entering METERS state; meters__poll draws the columns."""
+    reset_pads_grid()
+    reset_arrow_buttons()
 
 
 def _set_default_state():
     """Set controller to default (off) state."""
     for note in range(BT_UP, BT_DEVICE + 1):
-        device.midiOutMsg(144, 0, note, LED_OFF)
-    for note in range(PAD_START, PAD_END + 1):
-        device.midiOutMsg(144, 0, note, LED_OFF)
+        leds__set(note, LED_OFF)
+    for note in _unit_notes(PAD_START, PAD_END):
+        leds__set(note, LED_OFF)
 
 
-def _set_placeholder_state():
-    """Set controller to placeholder state (all yellow)."""
-    for note in range(BT_UP, BT_DEVICE + 1):
-        device.midiOutMsg(144, 0, note, LED_OFF)
-    for note in range(PAD_START, PAD_END + 1):
-        device.midiOutMsg(144, 0, note, LED_YELLOW)
+# ============================================================================
+# DEFERRED TASK SCHEDULER
+# ============================================================================
+# Callbacks must never sleep: FL runs them on its UI/MIDI thread. Work that
+# has to wait is queued here and run by OnIdle once its delay has elapsed
+# or its condition holds.
+
+def scheduler__after(delay, callback, *args, key=None):
+    """Run callback(*args) on the first idle tick at least delay seconds from now.
+    
+    Queuing a task with a key replaces any pending task with the same key.
+    """
+    _scheduler__add({
+        "due": time.perf_counter() + delay,
+        "condition": None,
+        "callback": callback,
+        "args": args,
+        "key": key
+    })
+
+
+def scheduler__when(condition, callback, *args, key=None):
+    """Run callback(*args) on the first idle tick where condition() is true."""
+    _scheduler__add({
+        "due": None,
+        "condition": condition,
+        "callback": callback,
+        "args": args,
+        "key": key
+    })
+
+
+def scheduler__cancel(key):
+    """Drop pending tasks queued with key."""
+    scheduler_tasks[:] = [task for task in scheduler_tasks if task["key"] != key]
+
+
+def scheduler__pending(key):
+    """Return True if a task queued with key has not run yet."""
+    for task in scheduler_tasks:
+        if task["key"] == key:
+            return True
+    return False
+
+
+def scheduler__run():
+    """Run due tasks. Tasks queued by a running task wait for the next tick."""
+    if not scheduler_tasks:
+        return
+    
+    now = time.perf_counter()
+    due_tasks = []
+    for task in scheduler_tasks:
+        if task["due"] is not None:
+            if now >= task["due"]:
+                due_tasks.append(task)
+        elif task["condition"]():
+            due_tasks.append(task)
+    
+    for task in due_tasks:
+        scheduler_tasks.remove(task)
+        
+        if task["due"] is not None:
+            late = now - task["due"]
+            scheduler_stats["late_total"] += late
+            scheduler_stats["late_max"] = max(scheduler_stats["late_max"], late)
+            log_scheduler("%s ran %.1f ms late", task["callback"].__name__, late * 1000)
+        scheduler_stats["runs"] += 1
+        
+        task["callback"](*task["args"])
+
+
+def scheduler__report():
+    """Print queue length and task lateness."""
+    runs = scheduler_stats["runs"]
+    avg_late = scheduler_stats["late_total"] / runs if runs else 0.0
+    print(f'Scheduler: {len(scheduler_tasks)} queued, {runs} run, '
+          f'late avg {avg_late * 1000:.1f} ms, max {scheduler_stats["late_max"] * 1000:.1f} ms')
+
+
+def _scheduler__add(task):
+    """Queue a task, replacing a pending one with the same key."""
+    if task["key"] is not None:
+        scheduler__cancel(task["key"])
+    scheduler_tasks.append(task)
+
+
+# ============================================================================
+# REFRESH DISPATCH
+# ============================================================================
+
+def refresh__register(mask, handler):
+    """Register handler(flags) to run when any bit of mask is dirty."""
+    if PROFILE:
+        handler = _profiled(handler.__name__, handler)
+    refresh_handlers.append((mask, handler))
+
+
+def refresh__service():
+    """Run every handler whose mask matches the accumulated dirty bits, once."""
+    global refresh_pending
+    
+    flags = refresh_pending
+    if not flags:
+        return
+    refresh_pending = 0
+    
+    log_refresh__service('Servicing dirty flags: %s', flags)
+    for state, mask in LAYER_DIRTY_MASKS.items():
+        if flags & mask:
+            layer_generation[state] += 1
+    for mask, handler in refresh_handlers:
+        if flags & mask:
+            handler(flags)
+
+
+def _on_refresh_patterns(flags):
+    """Reload pattern data after pattern or track modifications."""
+    log_OnRefresh("Pattern or track modification detected")
+    if flags & HW_Dirty_ChannelRackGroup:
+        # Channel indexes follow the displayed group, so every grid is off
+        grid_cache.clear()
+    patterns__get_data(refresh=True)
+    if STATES[current_state_index] == "PATTERNS":
+        patterns__update_pads("all")
+
+
+def _on_refresh_playback(flags):
+    """Check for playback state changes."""
+    global playing, playing_his, beat_cnt, bar_cnt, pattern_follow_playindex, playhead_step
+    
+    playing = transport.isPlaying()
+    if playing_his != playing:
+        log_OnRefresh('Playback state changed: %s', playing)
+        playing_his = playing
+        layer_generation["PATTERNS"] += 1  # A saved frame may hold the playhead column
+        
+        if playing:
+            _update_time_signature()  # PPQ can only have changed while stopped
+        else:
+            beat_cnt = 0
+            bar_cnt = 0
+            playhead_step = -1
+            if STATES[current_state_index] == "PATTERNS":
+                pattern_follow_playindex = True
+                patterns__update_pads("all")
+
+
+def _on_refresh_control_values(flags):
+    """Invalidate the open plugin's mirrored values changed outside the script.
+    
+    FL does not say which parameter moved, so every mirrored value is dropped
+    except those the script wrote itself since the last refresh (their
+    echo). Values are re-read lazily, when next needed.
+    """
+    global plugin_par_echo
+    
+    if plugin_view:
+        track, slot = selected_plugin
+        record = tracks_data[track].slots[slot]
+        record.loaded &= plugin_par_echo
+    plugin_par_echo = 0
+
+
+def _on_refresh_clips(flags):
+    """Drop the occupancy index after a performance layout change and redraw CLIPS.
+    
+    Clip launches and edits arrive per track through OnUpdateLiveMode; only
+    a layout change (blocks moved or resized) invalidates every track.
+    """
+    if flags & HW_Dirty_Performance:
+        clips__invalidate(0, len(clip_tracks) - 1)
+    if STATES[current_state_index] == "CLIPS" and not scheduler__pending("set_state"):
+        clips__get_data()
+        clips__display_on_pads()
+
+
+def _on_refresh_plugins(flags):
+    """Rescan the rack after plugin modifications (outside PLUGINS: on entry)."""
+    global rack_valid, plugins_crawler
+    
+    rack_valid = False
+    plugins_crawler = None
+    if STATES[current_state_index] == "PLUGINS":
+        plugins__get_data()
 
 
 # ============================================================================
 # PATTERN MODE FUNCTIONS
 # ============================================================================
 
-def patterns__get_data():
-    """Query FL Studio for pattern data and populate grid_data."""
-    global grid_data, pattern_length
+def patterns__get_data(refresh=False):
+    """Select the grid of the current pattern, re-reading only what may have changed.
+    
+    Grids are kept in grid_cache across pattern switches, so switching back
+    to a pattern draws from memory. With refresh set (a dirty flag was seen),
+    the data of a pattern that stayed active or was edited since it became
+    active (see OnRefresh) is marked stale. Only the visible rows
+    of the current page are fetched here; the rest is loaded lazily by
+    patterns__fetch_pending() on idle ticks.
+    """
+    global grid_data, grid_pattern, grid_pending, pattern_length, refresh_pattern
     
     n_channels = channels.channelCount()
-    pattern_length = patterns.getPatternLength(patterns.patternNumber())
-    n_beats = math.floor(pattern_length / 4)
+    pattern_number = patterns.patternNumber()
+    length = patterns.getPatternLength(pattern_number)
+    n_beats = math.floor(length / 4)
     
-    # Calculate required pages
-    n_pages = math.floor(pattern_length / PAD_GRID_SIZE_X)
+    # Calculate required pages (a page spans every unit)
+    n_pages = math.ceil(length / GRID_WIDTH)
     current_page = navigation["PATTERNS"]["current_page"]
     
     if current_page >= n_pages:
@@ -372,79 +1241,266 @@ def patterns__get_data():
     
     navigation["PATTERNS"]["pages"] = n_pages
     
-    debug_print(f"Pattern length: {pattern_length}, beats: {n_beats}, pages: {n_pages}")
-    debug_print(f"Current page: {current_page}/{n_pages}")
-    
-    # Build grid data matrix
-    grid_data = [[-1] * pattern_length for _ in range(n_channels)]
-    
-    for channel in range(n_channels):
+    # Channels are shown PATTERN_GRID_SIZE_Y at a time
+    n_windows = math.ceil(n_channels / PATTERN_GRID_SIZE_Y)
+    navigation["CHANNELS"]["pages"] = n_windows
+    navigation["CHANNELS"]["current_page"] = clip(navigation["CHANNELS"]["current_page"], 0, max(0, n_windows - 1))
+    
+    log_patterns__get_data("Pattern length: %s, beats: %s, pages: %s", length, n_beats, n_pages)
+    log_patterns__get_data("Current page: %s/%s", current_page, n_pages)
+    
+    # FL only edits the active pattern, so other cached grids stay valid. A
+    # switch and an edit of the new pattern can be serviced together, hence
+    # patterns_edited. The name catches patterns renumbered by inserts or
+    # deletes in the meantime.
+    invalidate = refresh and (pattern_number == grid_pattern or pattern_number in patterns_edited)
+    patterns_edited.clear()
+    refresh_pattern = pattern_number
+    name = patterns.getPatternName(pattern_number)
+    cached_name, grid = grid_cache.pop(pattern_number, (None, None))
+    if grid is None or cached_name != name or len(grid) != n_channels:
+        grid = PatternGrid(n_channels, length)
+        invalidate = True
+    elif length != grid.length:
+        grid.resize(length)
+        invalidate = True
+    grid_cache[pattern_number] = (name, grid)
+    _patterns__trim_cache()
+    
+    grid_data = grid
+    grid_pattern = pattern_number
+    pattern_length = length
+    
+    if invalidate:
+        n_blocks = math.ceil(length / PAD_GRID_SIZE_X)
+        grid.stale = [(1 << n_blocks) - 1] * n_channels
+    grid_pending = True
+    
+    _patterns__fetch_visible()
+
+
+def _patterns__first_channel():
+    """Return the channel shown on the top row of the pattern grid."""
+    return navigation["CHANNELS"]["current_page"] * PATTERN_GRID_SIZE_Y
+
+
+def _patterns__trim_cache():
+    """Evict least recently used grids until the cache fits GRID_CACHE_MAX_STEPS."""
+    total = 0
+    for _, grid in grid_cache.values():
+        total += len(grid) * grid.length
+    for pattern_number in list(grid_cache)[:-1]:
+        if total <= GRID_CACHE_MAX_STEPS:
+            break
+        _, grid = grid_cache.pop(pattern_number)
+        total -= len(grid) * grid.length
+        log_patterns__get_data("Evicted cached grid of pattern %s", pattern_number)
+
+
+def patterns__fetch_pending(budget):
+    """Load up to budget stale blocks around the visible channel window.
+    
+    Channels further than PATTERNS_PREFETCH_WINDOWS windows away are left
+    stale until scrolled near. Returns True while blocks remain.
+    """
+    global grid_pending
+    
+    stale_rows = grid_data.stale
+    first = _patterns__first_channel()
+    span = PATTERNS_PREFETCH_WINDOWS * PATTERN_GRID_SIZE_Y
+    # Visible window first, then the ones below and above it
+    channels_by_priority = list(range(first, first + PATTERN_GRID_SIZE_Y)) \
+        + list(range(first + PATTERN_GRID_SIZE_Y, first + PATTERN_GRID_SIZE_Y + span)) \
+        + list(range(first - 1, first - 1 - span, -1))
+    for channel in channels_by_priority:
+        if not 0 <= channel < len(stale_rows):
+            continue
+        while stale_rows[channel]:
+            if budget <= 0:
+                return True
+            stale = stale_rows[channel]
+            _patterns__fetch_block(channel, (stale & -stale).bit_length() - 1)
+            budget -= 1
+    
+    grid_pending = False
+    if PATTERNS_VERIFY_FETCH:
+        patterns__verify_data()
+    return False
+
+
+def patterns__verify_data():
+    """Re-read the loaded cells of the pattern and report where grid_data disagrees."""
+    mismatches = 0
+    for channel in range(len(grid_data)):
         for idx in range(pattern_length):
-            grid_data[channel][idx] = channels.getGridBit(channel, idx)
-            if grid_data[channel][idx] == 1:
-                debug_print(f'Note @ channel {channels.getChannelName(channel)}, pos {idx}')
+            if grid_data.stale[channel] >> math.floor(idx / PAD_GRID_SIZE_X) & 1:
+                continue
+            value = channels.getGridBit(channel, idx)
+            if grid_data.get(channel, idx) != value:
+                print(f'Pattern data mismatch @ channel {channel}, pos {idx}: '
+                      f'stored {grid_data.get(channel, idx)}, FL {value}')
+                mismatches += 1
+    print(f'Pattern data verified: {mismatches} mismatches')
+    return mismatches
+
+
+def _patterns__fetch_block(channel, block):
+    """Read one 8-step block of a channel from FL Studio."""
+    first = block * PAD_GRID_SIZE_X
+    on = 0
+    valid = 0
+    for idx in range(first, min(first + PAD_GRID_SIZE_X, pattern_length)):
+        bit = 1 << (idx - first)
+        valid |= bit
+        if channels.getGridBit(channel, idx) == 1:
+            on |= bit
+            if log_patterns__get_data.on:
+                log_patterns__get_data('Note @ channel %s, pos %s', channels.getChannelName(channel), idx)
+    grid_data.set_block(channel, block, on, valid)
+    grid_data.stale[channel] &= ~(1 << block)
+
+
+def _patterns__fetch_visible():
+    """Make sure the rows shown on the current page hold fresh data."""
+    page = navigation["PATTERNS"]["current_page"]
+    if page < 0:
+        return
+    stale_rows = grid_data.stale
+    first = _patterns__first_channel()
+    for channel in range(first, min(first + PATTERN_GRID_SIZE_Y, len(stale_rows))):
+        for block in range(page * UNITS, (page + 1) * UNITS):  # One 8-step block per unit
+            if stale_rows[channel] >> block & 1:
+                _patterns__fetch_block(channel, block)
 
 
 def patterns__update_pads(mode):
     """Update pattern pad LEDs based on current page and data."""
-    reset_pads_grid(mode)
+    _patterns__fetch_visible()
     
     current_page = navigation["PATTERNS"]["current_page"]
     n_pages = navigation["PATTERNS"]["pages"]
     
     # Draw navigation row
-    for page in range(PAD_PAGE_NAVIGATION_START, PAD_PAGE_NAVIGATION_END + 1):
+    for page in range(PAD_GRID_SIZE_X * UNITS):
         if page == current_page:
             colour = LED_YELLOW_BLINK
         elif page < n_pages:
             colour = LED_YELLOW
         else:
             colour = LED_OFF
-        device.midiOutMsg(144, 0, page, colour)
+        leds__set(_pattern_page_to_note(page), colour)
     
-    # Update arrow buttons
+    # Update separator row and arrow buttons
     if mode == "all":
-        device.midiOutMsg(144, 0, BT_RIGHT, LED_RED if current_page < n_pages - 1 else LED_OFF)
-        device.midiOutMsg(144, 0, BT_LEFT, LED_RED if current_page > 0 else LED_OFF)
-    
-    # Draw pattern grid
-    x_range_min = current_page * PAD_GRID_SIZE_X
-    x_range_max = x_range_min + PAD_GRID_SIZE_X
-    
-    for row in range(min(PATTERN_GRID_SIZE_Y, len(grid_data))):
-        for x in range(x_range_min, x_range_max):
-            val = grid_data[row][x]
-            
-            if val == -1:
-                colour = LED_OFF
-            elif val == 0:
-                colour = LED_GREEN
-            else:  # val == 1
-                colour = LED_GREEN_BLINK
-            
-            pad = x - x_range_min
-            note = _padgrid_xy_to_note(pad, row)
-            
-            debug_print(f'Row: {row}, pad: {pad}, note: {note}, colour: {colour}')
-            device.midiOutMsg(144, 0, note, colour)
-
-
-def patterns__update_single_pad(note):
-    """Toggle a single pattern pad and update FL Studio."""
-    current_page = navigation["PATTERNS"]["current_page"]
-    idx_pad, idx_channel = _pattern_note_to_data_indices(note, current_page)
+        for note in _unit_notes(PAD_PATTERN_SEPARATOR_START, PAD_PATTERN_SEPARATOR_END):
+            leds__set(note, LED_OFF)
+        leds__set(BT_RIGHT, LED_RED if current_page < n_pages - 1 else LED_OFF)
+        leds__set(BT_LEFT, LED_RED if current_page > 0 else LED_OFF)
+        window = navigation["CHANNELS"]["current_page"]
+        leds__set(BT_UP, LED_RED if window > 0 else LED_OFF)
+        leds__set(BT_DOWN, LED_RED if window < navigation["CHANNELS"]["pages"] - 1 else LED_OFF)
+    
+    # Draw pattern grid, one row at a time (rows without a channel stay off)
+    view = grid_data.page_view(current_page, _patterns__first_channel(), PATTERN_GRID_SIZE_Y)
+    for row in range(PATTERN_GRID_SIZE_Y):
+        on, valid = view[row] if row < len(view) else (0, 0)
+        if log_patterns__update_pads.on:
+            log_patterns__update_pads('Row: %s, on: %s, valid: %s', row, bin(on), bin(valid))
+        first_note = _padgrid_xy_to_note(0, row)
+        for unit, colours in enumerate(_pattern_row_colours(on, valid)):
+            leds__set_row(unit * UNIT_NOTES + first_note, colours)
+    
+    # Keep the playhead visible across full redraws
+    if PLAYHEAD_MODE == "SONGPOS" and math.floor(playhead_step / GRID_WIDTH) == current_page:
+        _patterns__draw_column(playhead_step, True)
+
+
+def _pattern_row_colours(on, valid):
+    """Return the LED colours of a page row given its on/valid bitmasks.
+    
+    Colours come as one list of 8 per unit.
+    """
+    key = (on, valid)
+    unit_colours = pattern_row_colours.get(key)
+    if unit_colours is None:
+        unit_colours = []
+        for unit in range(UNITS):
+            colours = []
+            for x in range(unit * PAD_GRID_SIZE_X, (unit + 1) * PAD_GRID_SIZE_X):
+                if not valid >> x & 1:
+                    colours.append(LED_OFF)
+                elif on >> x & 1:
+                    colours.append(LED_GREEN_BLINK)
+                else:
+                    colours.append(LED_GREEN)
+            unit_colours.append(colours)
+        pattern_row_colours[key] = unit_colours
+    return unit_colours
+
+
+def patterns__update_single_pad(note, x, y):
+    """Toggle the pattern pad at page column x, row y and update FL Studio."""
+    idx_pad = navigation["PATTERNS"]["current_page"] * GRID_WIDTH + x
+    idx_channel = _patterns__first_channel() + y
+    if idx_channel >= len(grid_data):
+        return
     
     # Toggle value
-    stored_value = grid_data[idx_channel][idx_pad]
+    stored_value = grid_data.get(idx_channel, idx_pad)
     new_value = 1 - stored_value
     
-    grid_data[idx_channel][idx_pad] = new_value
+    grid_data.set(idx_channel, idx_pad, new_value)
     channels.setGridBit(idx_channel, idx_pad, new_value)
     
-    debug_print(f'Channel: {channels.getChannelName(idx_channel)}, pos: {idx_pad}, value: {new_value}')
+    if log_patterns__update_single_pad.on:
+        log_patterns__update_single_pad('Channel: %s, pos: %s, value: %s',
+                                        channels.getChannelName(idx_channel), idx_pad, new_value)
     
     colour = LED_GREEN if new_value == 0 else LED_GREEN_BLINK
-    device.midiOutMsg(144, 0, note, colour)
+    leds__set(note, colour, LED_PRIO_FEEDBACK)
+
+
+def patterns__update_playhead():
+    """Move the playhead to the step the transport is at.
+    
+    Only the column the playhead left and the column it entered are
+    repainted, unless following playback turns the page.
+    """
+    global playhead_step
+    
+    if pattern_length <= 0:
+        return
+    step = int(transport.getSongPos(SONGLENGTH_ABSTICKS)) // ticks_per_step % pattern_length
+    if step == playhead_step:
+        return
+    
+    current_page = navigation["PATTERNS"]["current_page"]
+    page_of_step = math.floor(step / GRID_WIDTH)
+    log_patterns__update_pads_playidx("Step %s on page %s, displaying page %s", step, page_of_step, current_page)
+    
+    if math.floor(playhead_step / GRID_WIDTH) == current_page:
+        _patterns__draw_column(playhead_step, False)
+    playhead_step = step
+    
+    if page_of_step != current_page and pattern_follow_playindex:
+        navigation["PATTERNS"]["current_page"] = page_of_step
+        patterns__update_pads("all")  # Draws the playhead column too
+    elif page_of_step == current_page:
+        _patterns__draw_column(step, True)
+
+
+def _patterns__draw_column(step, highlight):
+    """Draw one step column of the current page, with or without the playhead."""
+    pos_x = step % GRID_WIDTH
+    on, valid = grid_data.column_view(step, _patterns__first_channel(), PATTERN_GRID_SIZE_Y)
+    for row in range(PATTERN_GRID_SIZE_Y):
+        if not valid >> row & 1:
+            colour = LED_OFF
+        elif highlight:
+            colour = LED_RED if on >> row & 1 else LED_YELLOW
+        else:
+            colour = LED_GREEN_BLINK if on >> row & 1 else LED_GREEN
+        leds__set(_padgrid_xy_to_note(pos_x, row), colour, LED_PRIO_PLAYHEAD)
 
 
 def patterns__update_pads_playidx():
@@ -454,7 +1510,7 @@ def patterns__update_pads_playidx():
     
     # Determine which page contains the current beat
     page_of_beat = math.floor((beat_cnt - 1) / BEATS_PER_PAGE)
-    debug_print(f"Beat {beat_cnt} on page {page_of_beat}, displaying page {current_page}")
+    log_patterns__update_pads_playidx("Beat %s on page %s, displaying page %s", beat_cnt, page_of_beat, current_page)
     
     # Handle page switching
     update_mode = "patterns"
@@ -476,18 +1532,12 @@ def patterns__update_pads_playidx():
             pos_x += 2
         
         # Highlight playback column
+        on, valid = grid_data.column_view(current_page * GRID_WIDTH + pos_x,
+                                          _patterns__first_channel(), PATTERN_GRID_SIZE_Y)
         for row in range(PATTERN_GRID_SIZE_Y):
-            note = ((PAD_GRID_SIZE_X - 1 - row) * PAD_GRID_SIZE_X) + pos_x
-            pad_status = grid_data[row][current_page * PAD_GRID_SIZE_X + pos_x]
-            
-            if pad_status == 1:
-                colour = LED_RED
-            elif pad_status == 0:
-                colour = LED_YELLOW
-            else:
-                continue
-            
-            device.midiOutMsg(144, 0, note, colour)
+            if valid >> row & 1:
+                colour = LED_RED if on >> row & 1 else LED_YELLOW
+                leds__set(_padgrid_xy_to_note(pos_x, row), colour, LED_PRIO_PLAYHEAD)
 
 
 # ============================================================================
@@ -495,48 +1545,218 @@ def patterns__update_pads_playidx():
 # ============================================================================
 
 def plugins__get_data():
-    """Query FL Studio for all plugin data across all tracks."""
-    global tracks_data
+    """Start a crawl of the mixer rack unless its data is still valid.
+    
+    The crawl runs on idle ticks (see plugins__crawl_pending), so entering
+    PLUGINS state or a rack invalidation never scans every track at once.
+    Parameter tables are not read here; they are loaded page by page when a
+    plugin is opened (see _plugins__load_pars).
+    """
+    global plugins_track_count, plugins_crawler, plugins_pads_v_ofst, rack_valid
     
     n_tracks = mixer.trackCount()
-    tracks_data = {}
+    if n_tracks != plugins_track_count:
+        rack_valid = False
+        plugins_crawler = None
+    if rack_valid or plugins_crawler is not None:
+        return
     
-    for track in range(n_tracks):
-        track_name = mixer.getTrackName(track)
-        debug_print(f"\nTrack: {track_name}")
-        
-        tracks_data[str(track)] = {
-            "name": track_name,
-            "plugins": {}
-        }
-        
-        for slot in range(MAX_PLUGINS_PER_TRACK):
-            if mixer.isTrackPluginValid(track, slot):
-                plugin_name = plugins.getPluginName(track, slot)
-                debug_print(f"Track {track}, Slot {slot}, Plugin: {plugin_name}")
-                
-                # Collect parameters
-                pars = {}
-                for par in range(plugins.getParamCount(track, slot)):
-                    par_name = plugins.getParamName(par, track, slot)
-                    par_value = plugins.getParamValue(par, track, slot)
-                    debug_print(f"Param {par}: {par_name} = {par_value}")
-                    
-                    pars[str(par)] = {
-                        "name": par_name,
-                        "value": par_value
-                    }
-                
-                tracks_data[str(track)]["plugins"][str(slot)] = {
-                    "name": plugin_name,
-                    "pars": pars
-                }
-            else:
-                # Empty slot
-                tracks_data[str(track)]["plugins"][str(slot)] = {
-                    "name": "empty",
-                    "pars": {}
-                }
+    plugins_track_count = n_tracks
+    del tracks_data[n_tracks:]
+    tracks_data.extend([None] * (n_tracks - len(tracks_data)))
+    plugins_pads_v_ofst = clip(plugins_pads_v_ofst, 0, max(0, n_tracks - 1))
+    
+    log_plugins__get_data("Crawling %s tracks", n_tracks)
+    plugins_crawler = _plugins__crawl(n_tracks)
+
+
+def plugins__crawl_pending(budget):
+    """Advance the rack crawl for up to budget seconds. Returns True while tracks remain."""
+    global plugins_crawler, rack_valid
+    
+    deadline = time.perf_counter() + budget
+    redraw = False
+    for track in plugins_crawler:
+        if plugins_pads_v_ofst <= track < plugins_pads_v_ofst + PLUGINS_TRACKS_PER_PAGE:
+            redraw = True
+        if time.perf_counter() >= deadline:
+            break
+    else:
+        plugins_crawler = None
+        rack_valid = True
+        log_plugins__get_data("Crawl complete")
+    
+    if redraw and STATES[current_state_index] == "PLUGINS" and not plugin_view:
+        plugins__display_on_pads()
+    return plugins_crawler is not None
+
+
+def _plugins__crawl(n_tracks):
+    """Scan the rack one track per step, the tracks on screen first.
+    
+    The on-screen window is re-read at every step, so paging during a crawl
+    moves the new page to the front.
+    """
+    remaining = set(range(n_tracks))
+    while remaining:
+        track = None
+        for candidate in range(plugins_pads_v_ofst, plugins_pads_v_ofst + PLUGINS_TRACKS_PER_PAGE):
+            if candidate in remaining:
+                track = candidate
+                break
+        if track is None:
+            track = min(remaining)
+        remaining.discard(track)
+        _plugins__scan_track(track)
+        yield track
+
+
+def _plugins__scan_track(track):
+    """Read the name and plugin slots of one mixer track into tracks_data."""
+    track_name = mixer.getTrackName(track)
+    log_plugins__get_data("\nTrack: %s", track_name)
+    
+    # Parameter counts and tables are loaded on demand
+    slots = []
+    for slot in range(MAX_PLUGINS_PER_TRACK):
+        if mixer.isTrackPluginValid(track, slot):
+            plugin_name = plugins.getPluginName(track, slot)
+            log_plugins__get_data("Track %s, Slot %s, Plugin: %s", track, slot, plugin_name)
+            slots.append(SlotRecord(plugin_name))
+        else:
+            slots.append(EMPTY_SLOT)
+    
+    tracks_data[track] = TrackRecord(track_name, slots)
+
+
+def plugins__descriptor(name, n_pars):
+    """Return the shared PluginDescriptor of a plugin type, creating it if needed."""
+    if not descriptor_cache_loaded:
+        _plugins__read_descriptor_cache()
+    
+    key = (name, n_pars)
+    descriptor = plugin_descriptors.get(key)
+    if descriptor is None:
+        descriptor = plugin_descriptors[key] = PluginDescriptor(name, n_pars)
+    return descriptor
+
+
+def _plugins__read_descriptor_cache():
+    """Add the descriptors saved by earlier sessions to plugin_descriptors."""
+    global descriptor_cache_loaded
+    
+    descriptor_cache_loaded = True
+    if DESCRIPTOR_CACHE_PATH is None:
+        return
+    
+    path = _script_relative_path(DESCRIPTOR_CACHE_PATH)
+    try:
+        with open(path) as cache_file:
+            cache = json.load(cache_file)
+    except (OSError, ValueError) as error:
+        log_plugins__get_data("No descriptor cache read from %s: %s", path, error)
+        return
+    if not isinstance(cache, dict) or cache.get("version") != DESCRIPTOR_CACHE_VERSION:
+        log_plugins__get_data("Ignoring descriptor cache %s: unknown version", path)
+        return
+    
+    # Nothing is kept from a file with a malformed entry
+    entries = cache.get("descriptors", [])
+    if not isinstance(entries, list):
+        entries = [entries]
+    descriptors = {}
+    for entry in entries:
+        if not (isinstance(entry, list) and len(entry) == 2 and isinstance(entry[0], str)
+                and isinstance(entry[1], list)
+                and all(par_name is None or isinstance(par_name, str) for par_name in entry[1])):
+            log_plugins__get_data("Ignoring descriptor cache %s: malformed entry %s", path, entry)
+            return
+        name, names = entry
+        cached = sum(1 << par for par, par_name in enumerate(names) if par_name is not None)
+        descriptors[(name, len(names))] = PluginDescriptor(name, len(names), names, cached)
+    
+    for key, descriptor in descriptors.items():
+        plugin_descriptors.setdefault(key, descriptor)
+    log_plugins__get_data("Read %s descriptors from %s", len(descriptors), path)
+
+
+def plugins__save_descriptor_cache():
+    """Write the parameter names learned so far to the descriptor cache."""
+    global descriptor_cache_dirty
+    
+    descriptor_cache_dirty = False
+    if DESCRIPTOR_CACHE_PATH is None:
+        return
+    
+    cache = {
+        "version": DESCRIPTOR_CACHE_VERSION,
+        "descriptors": [[descriptor.name, descriptor.names] for descriptor in plugin_descriptors.values()]
+    }
+    path = _script_relative_path(DESCRIPTOR_CACHE_PATH)
+    try:
+        with open(path, "w") as cache_file:
+            json.dump(cache, cache_file, separators=(",", ":"))
+    except OSError as error:
+        log_plugins__get_data("Descriptor cache not written to %s: %s", path, error)
+
+
+def _plugins__verify_descriptor(descriptor, track, slot, first):
+    """Check a cached descriptor against FL on its first cached name from parameter first.
+    
+    Nothing is checked while the cache holds no name from first on.
+    """
+    pending = descriptor.cached >> first
+    if not pending:
+        return
+    par = first + (pending & -pending).bit_length() - 1
+    
+    name = plugins.getParamName(par, track, slot)
+    if descriptor.names[par] != name:
+        log_plugins__get_data("Cached names of %s are out of date", descriptor.name)
+        descriptor.names = [None if descriptor.cached >> idx & 1 else par_name
+                            for idx, par_name in enumerate(descriptor.names)]
+    descriptor.names[par] = name
+    descriptor.cached = 0
+
+
+def _plugins__load_pars(track, slot, first, last):
+    """Load names and values of parameters [first, last) not loaded yet.
+    
+    Names already read for another instance of the same plugin, or in an
+    earlier session (see DESCRIPTOR_CACHE_PATH), are reused. Returns the
+    plugin's parameter count.
+    """
+    global descriptor_cache_dirty
+    
+    record = tracks_data[track].slots[slot]
+    if record.name is None:
+        return 0
+    if record.descriptor is None:
+        record.attach(plugins__descriptor(record.name, plugins.getParamCount(track, slot)))
+    
+    descriptor = record.descriptor
+    last = min(last, descriptor.n_pars)
+    if descriptor.cached and first < last:
+        _plugins__verify_descriptor(descriptor, track, slot, first)
+    
+    names = descriptor.names
+    values = record.values
+    learned = False
+    for par in range(first, last):
+        if record.loaded >> par & 1 and names[par] is not None:
+            continue
+        if names[par] is None:
+            names[par] = plugins.getParamName(par, track, slot)
+            learned = True
+        values[par] = plugins.getParamValue(par, track, slot)
+        record.loaded |= 1 << par
+        log_plugins__get_data("Param %s: %s = %s", par, names[par], values[par])
+    
+    if learned and DESCRIPTOR_CACHE_PATH is not None:
+        descriptor_cache_dirty = True
+        scheduler__after(DESCRIPTOR_SAVE_DELAY, plugins__save_descriptor_cache, key="descriptor_save")
+    
+    return descriptor.n_pars
 
 
 def plugins__display_on_pads():
@@ -544,17 +1764,14 @@ def plugins__display_on_pads():
     reset_pads_grid("all")
     
     first_track = plugins_pads_v_ofst
-    last_track = min(first_track + 4, len(tracks_data))
+    last_track = min(first_track + PLUGINS_TRACKS_PER_PAGE, plugins_track_count)
     
     for track in range(first_track, last_track):
-        track_key = str(track)
-        if track_key not in tracks_data:
+        track_record = tracks_data[track]
+        if track_record is None:
             continue
         
-        plugins_dict = tracks_data[track_key]["plugins"]
-        slot_idx = 0
-        
-        for slot_data in plugins_dict.values():
+        for slot_idx, slot_record in enumerate(track_record.slots):
             # Calculate position (2 rows per track, 5 slots per row)
             y = (track - first_track) * 2
             if slot_idx >= 5:
@@ -564,89 +1781,310 @@ def plugins__display_on_pads():
             note = _padgrid_xy_to_note(x, y)
             
             # Determine color based on track and slot status
-            if slot_data["name"] == "empty":
+            if slot_record.name is None:
                 colour = LED_RED if track == 0 else (LED_YELLOW if track % 2 == 0 else LED_GREEN)
             else:
                 colour = LED_RED_BLINK if track == 0 else (LED_YELLOW_BLINK if track % 2 == 0 else LED_GREEN_BLINK)
             
-            device.midiOutMsg(144, 0, note, colour)
-            slot_idx += 1
+            leds__set(note, colour)
+    
+    # Up/down page through the rack
+    leds__set(BT_UP, LED_RED if first_track > 0 else LED_OFF)
+    leds__set(BT_DOWN, LED_RED if first_track + PLUGINS_TRACKS_PER_PAGE < plugins_track_count else LED_OFF)
 
 
-def plugins__select_on_pad(note):
+def plugins__select_on_pad(track_row, slot):
     """Select a plugin and transition to parameter control view."""
-    global plugin_view, selected_plugin
-    
-    x, y = _padgrid_note_to_xy(note)
-    track = math.floor(y / 2)
-    slot = x if y % 2 == 0 else x + 5
-    
-    debug_print(f"Note {note} -> Track {track}, Slot {slot}")
+    global plugin_view, selected_plugin, device_fader_block
     
-    track_key = str(track)
-    slot_key = str(slot)
+    track = plugins_pads_v_ofst + track_row
+    log_plugins__select_on_pad("Track %s, Slot %s", track, slot)
     
     # Validate data exists
-    if track_key not in tracks_data or slot_key not in tracks_data[track_key]["plugins"]:
-        debug_print(f"Invalid selection: Track {track_key}, Slot {slot_key}")
+    if track >= len(tracks_data) or tracks_data[track] is None or slot >= len(tracks_data[track].slots):
+        log_plugins__select_on_pad("Invalid selection: Track %s, Slot %s", track, slot)
         return
     
     selected_plugin = [track, slot]
     plugin_view = True
-    reset_pads_grid()
+    tracks_data[track].slots[slot].loaded = 0  # Values may have moved while closed
+    device_fader_block = 0
+    input__build_routes()
     
-    plugin = tracks_data[track_key]["plugins"][slot_key]
-    n_pars = len(plugin["pars"])
+    plugin_name = tracks_data[track].slots[slot].name or "empty"
+    n_pars = _plugins__load_pars(track, slot, 0, 0)
+    navigation["PLUGIN_PARS"]["pages"] = math.ceil(n_pars / PLUGIN_PARS_PER_PAGE)
     
-    debug_print(f"Selected: {plugin['name']}, {n_pars} parameters")
-    ui.setHintMsg(f"{plugin['name']}")
+    log_plugins__select_on_pad("Selected: %s, %s parameters", plugin_name, n_pars)
+    ui.setHintMsg(f"{plugin_name}")
+    
+    plugins__show_par_page(0)
+
+
+def plugins__show_par_page(page):
+    """Load and display one page of the selected plugin's parameters."""
+    track, slot = selected_plugin
+    navigation["PLUGIN_PARS"]["current_page"] = page
+    n_pages = navigation["PLUGIN_PARS"]["pages"]
+    
+    first_par = page * PLUGIN_PARS_PER_PAGE
+    n_pars = _plugins__load_pars(track, slot, first_par, first_par + PLUGIN_PARS_PER_PAGE)
+    
+    reset_pads_grid()
     
     # Display parameter grid (3 rows per parameter: name, +, -)
-    for par_idx in range(n_pars):
-        y_par = math.floor(par_idx / PAD_GRID_SIZE_X) * 3
+    for par_idx in range(first_par, min(first_par + PLUGIN_PARS_PER_PAGE, n_pars)):
+        y_par = math.floor((par_idx - first_par) / PAD_GRID_SIZE_X) * 3
         x_par = par_idx % PAD_GRID_SIZE_X
         
-        if y_par < PAD_GRID_SIZE_X:
-            note_par = _padgrid_xy_to_note(x_par, y_par)
-            colour = LED_GREEN if note_par % 2 == 0 else LED_RED
-            device.midiOutMsg(144, 0, note_par, colour)
+        note_par = _padgrid_xy_to_note(x_par, y_par)
+        colour = LED_GREEN if note_par % 2 == 0 else LED_RED
+        leds__set(note_par, colour)
+    
+    _plugins__resolve_fader_pars()
     
-    # Enable left button to exit plugin view
+    # Left exits plugin view, up/down page through parameters
     reset_arrow_buttons()
-    device.midiOutMsg(144, 0, BT_LEFT, LED_RED)
+    leds__set(BT_LEFT, LED_RED)
+    leds__set(BT_UP, LED_RED if page > 0 else LED_OFF)
+    leds__set(BT_DOWN, LED_RED if page < n_pages - 1 else LED_OFF)
 
 
-def plugins__set_par_val(note):
-    """Adjust plugin parameter value using pad grid."""
-    x, y = _padgrid_note_to_xy(note)
-    par_idx = x + math.floor(y / 3) * PAD_GRID_SIZE_X
+def plugins__focus_fader_block(block):
+    """Put one block of the shown parameter page on the faders (DEVICE mode)."""
+    global device_fader_block
     
-    if y % 3 == 0:
-        # Parameter name row (no action currently)
-        return
+    device_fader_block = block
+    track, slot = selected_plugin
+    _plugins__load_pars(track, slot, 0, 0)  # Re-attaches the descriptor after a rack rescan
+    _plugins__resolve_fader_pars()
     
-    # Increment (+) or decrement (-) parameter
-    op = "+" if y % 3 == 1 else "-"
+    pars = [target[2] for target in device_fader_pars if target is not None]
+    if not pars:
+        return  # Empty slot, or a block past the last parameter
+    par_names = tracks_data[track].slots[slot].descriptor.names
+    ui.setHintMsg(f"Faders: {par_names[pars[0]]} - {par_names[pars[-1]]}")
+
+
+def _plugins__resolve_fader_pars():
+    """Map the faders to the focused block of the shown parameter page."""
     track, slot = selected_plugin
+    n_pars = tracks_data[track].slots[slot].n_pars()
+    first_par = (navigation["PLUGIN_PARS"]["current_page"] * PLUGIN_PARS_PER_PAGE
+                 + device_fader_block * PAD_GRID_SIZE_X)
     
-    stored_val = tracks_data[str(track)]["plugins"][str(slot)]["pars"][str(par_idx)]["value"]
-    current_val = plugins.getParamValue(par_idx, track, slot)
+    for fader in range(N_FADERS):
+        par_idx = first_par + fader
+        device_fader_pars[fader] = (track, slot, par_idx) if par_idx < n_pars else None
+    log_faders("DEVICE faders -> %s", device_fader_pars)
+
+
+def plugins__set_par_val(par_offset, op):
+    """Increment (+) or decrement (-) a parameter of the shown page.
     
-    # Determine step size
-    if current_val == stored_val:
-        mod = 0.05 if op == "+" else -0.05
-    else:
-        mod = 0.1 if op == "+" else -0.1
+    The pad repeats, faster and faster, for as long as it is held (see
+    plugins__stop_par_repeat).
+    """
+    global plugin_par_repeating
+    
+    _plugins__step_par(par_offset, op, PLUGIN_PAR_STEP)
+    plugin_par_repeating = (par_offset, op)  # The last pad pressed takes over the repeat
+    scheduler__after(PLUGIN_PAR_REPEAT_DELAY, _plugins__repeat_par, par_offset, op, PLUGIN_PAR_STEP,
+                     key="par_repeat")
+
+
+def plugins__stop_par_repeat(par_offset, op):
+    """Stop repeating when the +/- pad owning the repeat is released."""
+    if plugin_par_repeating == (par_offset, op):
+        scheduler__cancel("par_repeat")
+
+
+def _plugins__repeat_par(par_offset, op, step):
+    """Repeat a held +/- pad with a growing step."""
+    step = min(step * PLUGIN_PAR_REPEAT_ACCEL, PLUGIN_PAR_STEP_MAX)
+    if _plugins__step_par(par_offset, op, step):
+        scheduler__after(PLUGIN_PAR_REPEAT_INTERVAL, _plugins__repeat_par, par_offset, op, step,
+                         key="par_repeat")
+
+
+def _plugins__step_par(par_offset, op, step):
+    """Move a parameter of the shown page by step. Returns False if it did not move.
+    
+    The current value comes from the mirror, so FL is only read when the
+    mirror was invalidated (see _on_refresh_control_values).
+    """
+    global plugin_par_echo
+    
+    par_idx = navigation["PLUGIN_PARS"]["current_page"] * PLUGIN_PARS_PER_PAGE + par_offset
+    track, slot = selected_plugin
+    
+    # The rack may have been rescanned since the page was shown
+    if par_idx >= _plugins__load_pars(track, slot, par_idx, par_idx + 1):
+        return False
+    
+    record = tracks_data[track].slots[slot]
+    current_val = record.values[par_idx]
+    new_val = clip(current_val + (step if op == "+" else -step), 0, 1)
+    if new_val == current_val:
+        return False
     
-    new_val = clip(current_val + mod, 0, 1)
     plugins.setParamValue(new_val, par_idx, track, slot)
-    tracks_data[str(track)]["plugins"][str(slot)]["pars"][str(par_idx)]["value"] = new_val
+    record.values[par_idx] = new_val
+    plugin_par_echo |= 1 << par_idx
+    
+    par_name = record.descriptor.names[par_idx]
+    ui.setHintMsg(f"{par_name}")
+    if log_plugins__set_par_val.on:
+        log_plugins__set_par_val("Track %s, Plugin %s, Param %s, Value: %s",
+                                 tracks_data[track].name, record.name, par_name, new_val)
+    return True
+
+
+# ============================================================================
+# CLIP LAUNCHER FUNCTIONS
+# ============================================================================
+# Pad rows are playlist tracks and pad columns are performance mode live
+# blocks. clip_tracks indexes which blocks hold and play clips. Entries are
+# dropped per track when FL reports a change and re-read only once they
+# scroll into view, so scrolling over indexed tracks costs no FL calls.
+
+def clips__get_data():
+    """Size the occupancy index to the playlist. Block states are read when shown."""
+    global clips_track_ofst
+    
+    n_tracks = playlist.trackCount()
+    if n_tracks != len(clip_tracks):
+        log_clips("Indexing %s playlist tracks", n_tracks)
+        del clip_tracks[n_tracks:]
+        clip_tracks.extend(ClipTrackRecord() for _ in range(n_tracks - len(clip_tracks)))
+    clips_track_ofst = clip(clips_track_ofst, 0, max(0, n_tracks - 1))
+
+
+def clips__invalidate(first, last):
+    """Drop the indexed block states of tracks first .. last (indexes, inclusive)."""
+    for record in clip_tracks[max(0, first):last + 1]:
+        record.loaded = 0
+
+
+def _clips__load_view():
+    """Read the block states on screen that the index does not hold."""
+    view_mask = ((1 << GRID_WIDTH) - 1) << clips_block_ofst
+    for track in range(clips_track_ofst, min(clips_track_ofst + PAD_GRID_SIZE_X, len(clip_tracks))):
+        record = clip_tracks[track]
+        missing = view_mask & ~record.loaded
+        if not missing:
+            continue
+        for block in range(clips_block_ofst, clips_block_ofst + GRID_WIDTH):
+            bit = 1 << block
+            if not missing & bit:
+                continue
+            status = playlist.getLiveBlockStatus(track + 1, block, LIVE_STATUS_SIMPLE)
+            record.filled = record.filled | bit if status else record.filled & ~bit
+            record.playing = record.playing | bit if status >= 2 else record.playing & ~bit
+        record.loaded |= missing
+
+
+def clips__display_on_pads():
+    """Display the live blocks of the visible tracks, one track per pad row."""
+    _clips__load_view()
+    
+    for y in range(PAD_GRID_SIZE_X):
+        track = clips_track_ofst + y
+        filled = playing = 0
+        if track < len(clip_tracks):
+            record = clip_tracks[track]
+            filled = record.filled >> clips_block_ofst
+            playing = record.playing >> clips_block_ofst
+        for x in range(GRID_WIDTH):
+            if playing >> x & 1:
+                colour = LED_GREEN
+            elif filled >> x & 1:
+                colour = LED_YELLOW
+            else:
+                colour = LED_OFF
+            leds__set(_padgrid_xy_to_note(x, y), colour)
+    
+    leds__set(BT_UP, LED_RED if clips_track_ofst > 0 else LED_OFF)
+    leds__set(BT_DOWN, LED_RED if clips_track_ofst + PAD_GRID_SIZE_X < len(clip_tracks) else LED_OFF)
+    leds__set(BT_LEFT, LED_RED if clips_block_ofst > 0 else LED_OFF)
+    leds__set(BT_RIGHT, LED_RED if clips_block_ofst + GRID_WIDTH < CLIP_BLOCKS else LED_OFF)
+
+
+def _clips__redraw():
+    """Redraw after live block changes, unless CLIPS was left meanwhile."""
+    if STATES[current_state_index] == "CLIPS":
+        clips__display_on_pads()
+
+
+def clips__launch(x, y):
+    """Launch the clip of a pad, or stop its track if that clip is playing."""
+    track = clips_track_ofst + y
+    block = clips_block_ofst + x
+    if track >= len(clip_tracks):
+        return
+    
+    record = clip_tracks[track]
+    if record.loaded >> block & 1 and record.playing >> block & 1:
+        log_clips("Stopping track %s", track + 1)
+        playlist.triggerLiveClip(track + 1, -1, TLC_MUTE_OTHERS)
+    else:
+        log_clips("Launching track %s, block %s", track + 1, block)
+        playlist.triggerLiveClip(track + 1, block, TLC_MUTE_OTHERS | TLC_FILL)
+
+
+# ============================================================================
+# PEAK METER FUNCTIONS
+# ============================================================================
+# Peaks are read at most every METER_POLL_INTERVAL, whatever the idle rate.
+# Decay and peak hold are computed here, between reads, and a column is
+# redrawn only when its lit or held pad changes.
+
+def meters__reset():
+    """Forget levels and drawn columns, e.g. on entering METERS state."""
+    global meter_polled
     
-    ui.setHintMsg(f"{tracks_data[str(track)]['plugins'][str(slot)]['pars'][str(par_idx)]['name']}")
-    debug_print(f"Track {tracks_data[str(track)]['name']}, "
-                f"Plugin {tracks_data[str(track)]['plugins'][str(slot)]['name']}, "
-                f"Param {tracks_data[str(track)]['plugins'][str(slot)]['pars'][str(par_idx)]['name']}, "
-                f"Value: {new_val}")
+    for x in range(N_FADERS):
+        meter_levels[x] = 0.0
+        meter_holds[x] = 0
+        meter_hold_until[x] = 0.0
+        meter_drawn[x] = None
+    meter_polled = 0.0
+
+
+def meters__poll():
+    """Read the metered tracks' peaks if a poll is due and redraw changed columns."""
+    global meter_polled
+    
+    now = time.perf_counter()
+    elapsed = now - meter_polled
+    if elapsed < METER_POLL_INTERVAL:
+        return
+    fall = METER_DECAY * min(elapsed, 1.0)
+    meter_polled = now
+    
+    for x in range(N_FADERS):
+        peak = mixer.getTrackPeaks(_fader_track(x), METER_PEAK_MODE)
+        step = bisect.bisect_right(METER_STEP_LEVELS, peak)
+        level = max(step, meter_levels[x] - fall)
+        meter_levels[x] = level
+        
+        if step >= meter_holds[x]:
+            meter_holds[x] = step
+            meter_hold_until[x] = now + METER_HOLD_TIME
+        elif now >= meter_hold_until[x]:
+            meter_holds[x] = math.ceil(level)
+        
+        shown = (math.ceil(level), meter_holds[x])
+        if shown != meter_drawn[x]:
+            _meters__draw_column(x, *shown)
+            meter_drawn[x] = shown
+
+
+def _meters__draw_column(x, lit, held):
+    """Light the bottom lit pads of column x and the held pad above them."""
+    for step in range(PAD_GRID_SIZE_X):
+        colour = METER_COLOURS[step] if step < lit or step == held - 1 else LED_OFF
+        leds__set(_padgrid_xy_to_note(x, PAD_GRID_SIZE_X - 1 - step), colour, LED_PRIO_PLAYHEAD)
 
 
 # ============================================================================
@@ -656,88 +2094,278 @@ def plugins__set_par_val(note):
 def _update_fader_button_leds(active_button):
     """Update fader mode button LEDs (only active button lit)."""
     if active_button in range(BT_VOL, BT_DEVICE + 1):
-        debug_print(f"Updating fader control LED: {active_button}")
+        log_faders("Updating fader control LED: %s", active_button)
         for note in range(BT_VOL, BT_DEVICE + 1):
             colour = LED_RED if note == active_button else LED_OFF
-            device.midiOutMsg(144, 0, note, colour)
+            leds__set(note, colour, LED_PRIO_FEEDBACK)
 
 
 def _handle_fader_input(cc_ch, cc_val):
-    """Route fader input to appropriate handler based on current mode."""
-    fader_mode = FADER_MODES[current_fader_mode_index]
-    debug_print(f'Fader {cc_ch}, value: {cc_val}, mode: {fader_mode}')
+    """Queue fader input; only the latest value per fader is applied on idle."""
+    log_faders('Fader %s, value: %s', cc_ch, cc_val)
+    fader_pending[cc_ch] = cc_val
+
+
+def faders__apply_pending():
+    """Apply the latest value of every fader moved since the last idle tick.
+    
+    Values equal to what was last written are dropped. With FADER_PICKUP,
+    a fader is ignored until it reaches (or crosses) the target's value.
+    """
+    pending = list(fader_pending.items())
+    fader_pending.clear()
     
-    if cc_ch in range(FADER_0, FADER_0 + N_FADERS):
-        if fader_mode == "VOLUME":
-            _fader_set_channel_volume(cc_ch, cc_val)
-        elif fader_mode == "PAN":
-            _fader_set_channel_pan(cc_ch, cc_val)
-        elif fader_mode == "SEND":
-            _fader_set_track_volume(cc_ch, cc_val)
-    elif cc_ch == FADER_MASTER:
-        mixer.setTrackVolume(0, cc_val / 127)
+    for cc_ch, cc_val in pending:
+        target = _fader_target(cc_ch, cc_val)
+        if target is None:
+            continue
+        setter, getter, index, value = target
+        key = (setter, index)
+        
+        if fader_written.get(key) == value:
+            continue
+        if FADER_PICKUP and not _fader_picked_up(key, getter, index, value):
+            continue
+        
+        log_faders('%s(%s, %s)', setter.__name__, index, value)
+        setter(index, value)
+        fader_written[key] = value
+
 
+def faders__reset():
+    """Forget written values and pickup state, e.g. when targets change."""
+    fader_pending.clear()
+    fader_written.clear()
+    fader_pickup_last.clear()
+    fader_picked_up.clear()
 
-def _fader_set_channel_volume(cc_ch, cc_val):
+
+def _fader_target(cc_ch, cc_val):
+    """Resolve a fader to (setter, getter, index, value) in the current mode."""
+    if cc_ch == FADER_MASTER:
+        return _fader_set_track_volume, _fader_get_track_volume, 0, cc_val / 127
+    
+    fader_mode = FADER_MODES[current_fader_mode_index]
+    if fader_mode == "VOLUME":
+        return _fader_set_channel_volume, _fader_get_channel_volume, cc_ch - FADER_OFFSET, cc_val / 127
+    elif fader_mode == "PAN":
+        return _fader_set_channel_pan, _fader_get_channel_pan, cc_ch - FADER_OFFSET, (cc_val - 64) / 64
+    elif fader_mode == "SEND":
+        track = _fader_track(cc_ch - FADER_OFFSET)
+        return _fader_set_track_volume, _fader_get_track_volume, track, cc_val / 127
+    elif fader_mode == "DEVICE":
+        par = device_fader_pars[cc_ch - FADER_OFFSET]
+        if par is not None:
+            return _fader_set_plugin_param, _fader_get_plugin_param, par, cc_val / 127
+    return None
+
+
+def _fader_track(fader):
+    """Return the mixer track of a fader in SEND mode, also shown by METERS."""
+    return fader + 1  # 0 is master track
+
+
+def _fader_picked_up(key, getter, index, value):
+    """Return True once a fader has caught up with its target's current value."""
+    if key in fader_picked_up:
+        return True
+    
+    current = getter(index)
+    previous = fader_pickup_last.get(key)
+    fader_pickup_last[key] = value
+    
+    crossed = previous is not None and (previous - current) * (value - current) <= 0
+    if crossed or abs(value - current) <= FADER_PICKUP_TOLERANCE:
+        log_faders('Fader picked up %s(%s) at %s', getter.__name__, index, current)
+        fader_picked_up.add(key)
+        return True
+    return False
+
+
+def _fader_set_channel_volume(channel, value):
     """Set channel volume from fader input."""
-    channel = cc_ch - FADER_OFFSET
-    channels.setChannelVolume(channel, cc_val / 127)
+    channels.setChannelVolume(channel, value)
 
 
-def _fader_set_channel_pan(cc_ch, cc_val):
+def _fader_get_channel_volume(channel):
+    """Get channel volume for fader pickup."""
+    return channels.getChannelVolume(channel)
+
+
+def _fader_set_channel_pan(channel, value):
     """Set channel pan from fader input."""
-    channel = cc_ch - FADER_OFFSET
-    pan_val = (cc_val - 64) / 64
-    channels.setChannelPan(channel, pan_val)
+    channels.setChannelPan(channel, value)
+
+
+def _fader_get_channel_pan(channel):
+    """Get channel pan for fader pickup."""
+    return channels.getChannelPan(channel)
 
 
-def _fader_set_track_volume(cc_ch, cc_val):
+def _fader_set_track_volume(track, value):
     """Set track volume from fader input."""
-    track = cc_ch - FADER_OFFSET + 1  # 0 is master track
-    mixer.setTrackVolume(track, cc_val / 127)
+    mixer.setTrackVolume(track, value)
+
+
+def _fader_get_track_volume(track):
+    """Get track volume for fader pickup."""
+    return mixer.getTrackVolume(track)
+
+
+def _fader_set_plugin_param(par, value):
+    """Set a (track, slot, parameter) plugin parameter from fader input."""
+    global plugin_par_echo
+    
+    track, slot, par_idx = par
+    plugins.setParamValue(value, par_idx, track, slot)
+    
+    # Keep the rack mirror in step if the parameter is loaded
+    track_record = tracks_data[track] if track < len(tracks_data) else None
+    if track_record is not None:
+        record = track_record.slots[slot]
+        if record.loaded >> par_idx & 1:
+            record.values[par_idx] = value
+            if plugin_view and selected_plugin == [track, slot]:
+                plugin_par_echo |= 1 << par_idx
+
+
+def _fader_get_plugin_param(par):
+    """Get a (track, slot, parameter) plugin parameter for fader pickup."""
+    track, slot, par_idx = par
+    return plugins.getParamValue(par_idx, track, slot)
 
 
 # ============================================================================
 # INPUT ROUTING HELPERS
 # ============================================================================
 
-def _handle_state_specific_input(note, current_state):
-    """Route pad/button input based on current state."""
-    global pattern_follow_playindex, plugin_view
+def input__build_routes():
+    """Precompile input_routes for the current state and sub-view.
+    
+    Every entry maps (status, data1) to a handler and its arguments, with
+    pad coordinates already resolved, so routing a message is one lookup.
+    Called whenever the state or sub-view changes.
+    """
+    global input_routes, input_shift_routes
+    
+    current_state = STATES[current_state_index]
+    routes = {}
+    
+    # Global buttons and faders
+    routes[(144, BT_STATE)] = (_on_state_button, ())
+    for note in range(BT_VOL, BT_DEVICE + 1):
+        routes[(144, note)] = (_on_fader_mode_button, (note,))
+    routes[(144, BT_PLAY)] = (transport.start, ())
+    routes[(144, BT_STOP)] = (transport.stop, ())
+    routes[(144, BT_SHIFT)] = (_on_shift_button, (True,))
+    routes[(128, BT_SHIFT)] = (_on_shift_button, (False,))
+    for cc in range(FADER_0, FADER_0 + N_FADERS):
+        routes[(176, cc)] = (_handle_fader_input, (cc,))
+    routes[(176, FADER_MASTER)] = (_handle_fader_input, (FADER_MASTER,))
     
     if current_state == "PATTERNS":
-        if note in range(PAD_PATTERN_SEPARATOR_START + 1, PAD_END + 1):
-            debug_print("Pattern grid pad pressed")
-            patterns__update_single_pad(note)
-            if playing:
-                pattern_follow_playindex = False
-        
-        elif note in range(PAD_PAGE_NAVIGATION_START, PAD_PAGE_NAVIGATION_END + 1):
-            debug_print("Navigation pad pressed")
-            _handle_pattern_page_navigation(note)
+        for note in _unit_notes(PAD_PATTERN_GRID_START, PAD_PATTERN_GRID_END):
+            x, y = _pattern_note_to_data_indices(note, 0)
+            routes[(144, note)] = (_on_pattern_pad, (note, x, y))
+        for page in range(PAD_GRID_SIZE_X * UNITS):
+            routes[(144, _pattern_page_to_note(page))] = (_handle_pattern_page_navigation, (page,))
+        routes[(144, BT_UP)] = (_handle_pattern_channel_navigation, (BT_UP,))
+        routes[(144, BT_DOWN)] = (_handle_pattern_channel_navigation, (BT_DOWN,))
+    
+    elif current_state == "PLUGINS" and plugin_view:
+        routes[(144, BT_LEFT)] = (_exit_plugin_view, ())
+        routes[(144, BT_UP)] = (_handle_plugin_par_page_navigation, (BT_UP,))
+        routes[(144, BT_DOWN)] = (_handle_plugin_par_page_navigation, (BT_DOWN,))
+        for note in range(PAD_START, PAD_END + 1):
+            x, y = _padgrid_note_to_xy(note)
+            par_offset = x + math.floor(y / 3) * PAD_GRID_SIZE_X
+            if par_offset >= PLUGIN_PARS_PER_PAGE:
+                continue
+            if y % 3 == 0:
+                # Name rows choose which block the faders control in DEVICE mode
+                routes[(144, note)] = (plugins__focus_fader_block, (math.floor(y / 3),))
+            else:
+                pad = (par_offset, "+" if y % 3 == 1 else "-")
+                routes[(144, note)] = (plugins__set_par_val, pad)
+                routes[(128, note)] = (plugins__stop_par_repeat, pad)
+    
+    elif current_state == "CLIPS":
+        for note in _unit_notes(PAD_START, PAD_END):
+            routes[(144, note)] = (clips__launch, _padgrid_note_to_xy(note))
+        for note in range(BT_UP, BT_RIGHT + 1):
+            routes[(144, note)] = (_handle_clips_navigation, (note,))
     
     elif current_state == "PLUGINS":
-        if note == BT_LEFT and plugin_view:
-            debug_print("Exiting plugin view")
-            set_state()
-            plugin_view = False
-        
-        elif note in range(PAD_END + 1):
-            if plugin_view:
-                plugins__set_par_val(note)
-            elif note % PAD_GRID_SIZE_X < 5:
-                plugins__select_on_pad(note)
+        routes[(144, BT_UP)] = (_handle_rack_page_navigation, (BT_UP,))
+        routes[(144, BT_DOWN)] = (_handle_rack_page_navigation, (BT_DOWN,))
+        for note in range(PAD_START, PAD_END + 1):
+            x, y = _padgrid_note_to_xy(note)
+            if x < 5:
+                routes[(144, note)] = (plugins__select_on_pad, (math.floor(y / 2), x if y % 2 == 0 else x + 5))
+    
+    input_routes = routes
+    input_shift_routes = {
+        (144, BT_STOP): (_show_diagnostics, ()),
+        (144, BT_STATE): (debug_dump, ())
+    }
+
+
+def _on_state_button():
+    """Cycle to the next controller state."""
+    global current_state_index
+    
+    layers__save()
+    current_state_index = (current_state_index + 1) % len(STATES)
+    log_OnMidiMsg('State changed to: %s', STATES[current_state_index])
+    set_state()
+
+
+def _on_fader_mode_button(note):
+    """Select the fader mode of a fader control button."""
+    global current_fader_mode_index
+    
+    current_fader_mode_index = note - BT_VOL
+    faders__reset()  # The faders now address different targets
+    _update_fader_button_leds(note)
+    log_OnMidiMsg('Fader mode: %s', FADER_MODES[current_fader_mode_index])
+
+
+def _on_shift_button(held):
+    """Track the SHIFT button used for hidden functions."""
+    global shift_held
+    shift_held = held
+
+
+def _show_diagnostics():
+    """Print profiling and scheduler reports (SHIFT + STOP)."""
+    profile__report()
+    scheduler__report()
+
+
+def _on_pattern_pad(note, x, y):
+    """Toggle a step from the pattern grid."""
+    global pattern_follow_playindex
+    
+    log_input("Pattern grid pad pressed")
+    patterns__update_single_pad(note, x, y)
+    if playing:
+        pattern_follow_playindex = False
 
 
-def _handle_pattern_page_navigation(note):
+def _exit_plugin_view():
+    """Return from plugin view to the plugin rack."""
+    log_input("Exiting plugin view")
+    set_state()
+
+
+def _handle_pattern_page_navigation(pushed_pad):
     """Handle pattern page navigation pad press."""
     global pattern_follow_playindex
     
     n_pages = navigation["PATTERNS"]["pages"]
     current_page = navigation["PATTERNS"]["current_page"]
-    pushed_pad = note - PAD_PAGE_NAVIGATION_START
     
-    debug_print(f"Navigation pad {pushed_pad}, total pages: {n_pages}")
+    log_input("Navigation pad %s, total pages: %s", pushed_pad, n_pages)
     
     if pushed_pad < n_pages and pushed_pad != current_page:
         navigation["PATTERNS"]["current_page"] = pushed_pad
@@ -747,6 +2375,63 @@ def _handle_pattern_page_navigation(note):
         pattern_follow_playindex = False
 
 
+def _handle_pattern_channel_navigation(note):
+    """Scroll the pattern grid up or down by one window of channels."""
+    global grid_pending
+    
+    n_windows = navigation["CHANNELS"]["pages"]
+    window = navigation["CHANNELS"]["current_page"]
+    new_window = window - 1 if note == BT_UP else window + 1
+    
+    if 0 <= new_window < n_windows:
+        log_input("Channel window %s/%s", new_window + 1, n_windows)
+        navigation["CHANNELS"]["current_page"] = new_window
+        grid_pending = True
+        patterns__update_pads("all")
+
+
+def _handle_rack_page_navigation(note):
+    """Scroll the plugin rack up or down by one page of tracks."""
+    global plugins_pads_v_ofst
+    
+    step = -PLUGINS_TRACKS_PER_PAGE if note == BT_UP else PLUGINS_TRACKS_PER_PAGE
+    first_track = plugins_pads_v_ofst + step
+    
+    if 0 <= first_track < plugins_track_count:
+        log_input("Rack tracks %s-%s/%s", first_track, first_track + PLUGINS_TRACKS_PER_PAGE - 1, plugins_track_count)
+        plugins_pads_v_ofst = first_track
+        plugins__display_on_pads()
+
+
+def _handle_clips_navigation(note):
+    """Scroll the clip launcher by one grid of tracks (UP/DOWN) or blocks (LEFT/RIGHT)."""
+    global clips_track_ofst, clips_block_ofst
+    
+    if note in (BT_UP, BT_DOWN):
+        first_track = clips_track_ofst + (PAD_GRID_SIZE_X if note == BT_DOWN else -PAD_GRID_SIZE_X)
+        if not 0 <= first_track < len(clip_tracks):
+            return
+        clips_track_ofst = first_track
+    else:
+        first_block = clips_block_ofst + (GRID_WIDTH if note == BT_RIGHT else -GRID_WIDTH)
+        if not 0 <= first_block <= CLIP_BLOCKS - GRID_WIDTH:
+            return
+        clips_block_ofst = first_block
+    log_input("Clips: tracks from %s, blocks from %s", clips_track_ofst + 1, clips_block_ofst)
+    clips__display_on_pads()
+
+
+def _handle_plugin_par_page_navigation(note):
+    """Handle parameter page navigation in plugin view."""
+    n_pages = navigation["PLUGIN_PARS"]["pages"]
+    current_page = navigation["PLUGIN_PARS"]["current_page"]
+    new_page = current_page - 1 if note == BT_UP else current_page + 1
+    
+    if 0 <= new_page < n_pages:
+        log_input("Parameter page %s/%s", new_page + 1, n_pages)
+        plugins__show_par_page(new_page)
+
+
 # ============================================================================
 # UTILITY FUNCTIONS
 # ============================================================================
@@ -754,28 +2439,31 @@ def _handle_pattern_page_navigation(note):
 def reset_pads_grid(mode="all"):
     """Turn off pad LEDs based on mode."""
     if mode == "all":
-        for note in range(PAD_START, PAD_END + 1):
-            device.midiOutMsg(144, 0, note, LED_OFF)
+        for note in _unit_notes(PAD_START, PAD_END):
+            leds__set(note, LED_OFF)
     elif mode == "patterns":
-        for note in range(PAD_PATTERN_GRID_START, PAD_PATTERN_GRID_END + 1):
-            device.midiOutMsg(144, 0, note, LED_OFF)
+        for note in _unit_notes(PAD_PATTERN_GRID_START, PAD_PATTERN_GRID_END):
+            leds__set(note, LED_OFF)
     elif mode == "no_navigation":
-        for note in range(PAD_START, PAD_PATTERN_SEPARATOR_END + 1):
-            device.midiOutMsg(144, 0, note, LED_OFF)
+        for note in _unit_notes(PAD_START, PAD_PATTERN_SEPARATOR_END):
+            leds__set(note, LED_OFF)
 
 
 def reset_arrow_buttons():
     """Turn off all arrow button LEDs."""
     for note in range(BT_UP, BT_RIGHT + 1):
-        device.midiOutMsg(144, 0, note, LED_OFF)
+        leds__set(note, LED_OFF)
 
 
 def init():
     """Initialize or re-initialize controller to default state."""
     global current_state_index, current_fader_mode_index, beat_cnt, bar_cnt
     
-    # Reset to default state
+    # Reset to default state; the controller's LEDs are unknown after (re)load
     current_state_index = 0
+    layer_snapshots.clear()
+    leds__link_units()
+    leds__invalidate()
     set_state()
     
     # Reset counters
@@ -787,70 +2475,169 @@ def init():
     
     # Initialize fader control to volume mode
     current_fader_mode_index = 0
-    time.sleep(0.1)  # Wait before turning volume button LED on
-    _update_fader_button_leds(BT_VOL)
+    faders__reset()
+    scheduler__after(SETTLE_DELAY, _update_fader_button_leds, BT_VOL)  # Turn volume button LED on
     
     return True
 
 
+# ============================================================================
+# LED FRAMEBUFFER
+# ============================================================================
+# Renderers draw into led_back; leds__flush() sends only the notes whose
+# colour differs from what the controller last received. Blanking a grid
+# and repainting it in the same callback therefore costs no MIDI traffic
+# for pads that end up with the same colour.
+#
+# Written notes are queued per unit at the priority of their latest write,
+# and a flush sends at most LED_FLUSH_BUDGET messages per unit, most urgent
+# queue first. A playhead step or a pressed pad thus goes out ahead of a
+# repaint still in progress; rewriting a queued note only moves it.
+
+def leds__set(note, colour, priority=LED_PRIO_BACKGROUND):
+    """Draw a colour into the back buffer and queue the note at priority."""
+    led_back[note] = colour
+    queued = led_queued[note]
+    if queued != priority:
+        queues = led_queues[note // UNIT_NOTES]
+        if queued is not None:
+            queues[queued].discard(note)
+        queues[priority].add(note)
+        led_queued[note] = priority
+
+
+def leds__set_row(first_note, colours, priority=LED_PRIO_BACKGROUND):
+    """Draw consecutive notes of one unit; a row that already matches costs one compare."""
+    last_note = first_note + len(colours)
+    if led_back[first_note:last_note] != colours:
+        led_back[first_note:last_note] = colours
+        queues = led_queues[first_note // UNIT_NOTES]
+        for note in range(first_note, last_note):
+            queued = led_queued[note]
+            if queued != priority:
+                if queued is not None:
+                    queues[queued].discard(note)
+                queues[priority].add(note)
+                led_queued[note] = priority
+
+
+def leds__flush(budget=LED_FLUSH_BUDGET):
+    """Send queued LEDs that changed, up to budget messages per unit. Returns the number sent.
+    
+    Each unit is diffed on its own, so a redraw confined to one unit costs
+    nothing on the others. Notes left over stay queued for the next flush.
+    """
+    sent = 0
+    for unit in range(UNITS):
+        remaining = budget
+        for queue in led_queues[unit]:
+            while queue and remaining:
+                note = queue.pop()
+                led_queued[note] = None
+                colour = led_back[note]
+                if led_front[note] != colour:
+                    if unit == 0:
+                        device.midiOutMsg(144, 0, note, colour)
+                    else:
+                        _leds__send_to_unit(unit, 0x90, note - unit * UNIT_NOTES, colour)
+                    led_front[note] = colour
+                    remaining -= 1
+            if not remaining:
+                break
+        sent += budget - remaining
+    return sent
+
+
+def _leds__send_to_unit(unit, status, data1, data2):
+    """Send a message to the controller of a linked unit, through its link script."""
+    device.dispatch(unit - 1, status + LINK_CHANNEL + (data1 << 8) + (data2 << 16))
+
+
+def leds__link_units():
+    """Tell each link script which unit it drives (see device_APCmini_link.py)."""
+    for unit in range(1, UNITS):
+        _leds__send_to_unit(unit, 0xB0, LINK_HELLO_CC, unit)
+
+
+def leds__invalidate():
+    """Forget what the controllers show so the next flush resends every LED."""
+    for unit in range(UNITS):
+        base = unit * UNIT_NOTES
+        for note in range(base + PAD_START, base + PAD_END + 1):
+            led_front[note] = None
+            leds__set(note, led_back[note])
+        for note in range(base + BT_UP, base + BT_DEVICE + 1):
+            led_front[note] = None
+            leds__set(note, led_back[note])
+
+
 # ============================================================================
 # COORDINATE CONVERSION FUNCTIONS
 # ============================================================================
 
 def _padgrid_xy_to_note(x, y):
-    """Convert grid coordinates (x, y) to MIDI note number."""
-    return ((PAD_GRID_SIZE_X - 1 - y) * PAD_GRID_SIZE_X) + x
+    """Convert logical grid coordinates (x, y) to a logical note number."""
+    unit, x = divmod(x, PAD_GRID_SIZE_X)
+    return unit * UNIT_NOTES + ((PAD_GRID_SIZE_X - 1 - y) * PAD_GRID_SIZE_X) + x
 
 
 def _padgrid_note_to_xy(note):
-    """Convert MIDI note number to grid coordinates (x, y)."""
+    """Convert a logical note number to logical grid coordinates (x, y)."""
+    unit, note = divmod(note, UNIT_NOTES)
     if note not in range(PAD_START, PAD_END + 1):
-        debug_print(f"Warning: note {note} not in pad grid range")
+        log_input("Warning: note %s not in pad grid range", note)
         return None, None
     
     y = PAD_GRID_SIZE_X - 1 - math.floor(note / PAD_GRID_SIZE_X)
-    x = note % PAD_GRID_SIZE_X
+    x = unit * PAD_GRID_SIZE_X + note % PAD_GRID_SIZE_X
     return x, y
 
 
 def _pattern_note_to_data_indices(note, page):
     """Convert pattern pad note to grid_data indices [position, channel]."""
+    unit, note = divmod(note, UNIT_NOTES)
     if note not in range(PAD_PATTERN_GRID_START, PAD_PATTERN_GRID_END + 1):
-        debug_print(f"Warning: note {note} not in pattern grid range")
+        log_input("Warning: note %s not in pattern grid range", note)
         return None, None
     
     y = PAD_GRID_SIZE_X - 1 - math.floor(note / PAD_GRID_SIZE_X)
-    x = PAD_GRID_SIZE_X * page + (note % PAD_GRID_SIZE_X)
+    x = GRID_WIDTH * page + unit * PAD_GRID_SIZE_X + (note % PAD_GRID_SIZE_X)
     return x, y
 
 
+def _pattern_page_to_note(page):
+    """Return the logical note of a page navigation pad (pads 0-7 of each unit)."""
+    unit, pad = divmod(page, PAD_GRID_SIZE_X)
+    return unit * UNIT_NOTES + PAD_PAGE_NAVIGATION_START + pad
+
+
+def _unit_notes(first, last):
+    """Return the logical notes first..last (inclusive) of every unit."""
+    return [unit * UNIT_NOTES + note for unit in range(UNITS) for note in range(first, last + 1)]
+
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def _parse_flags(flag):
-    """Parse refresh flag into individual flag names."""
-    found_flags = []
-    n = flag
-    
-    for i in range(len(ONREFRESH_FLAGS) - 1, -1, -1):
-        exp = math.pow(2, i)
-        if n - exp >= 0:
-            debug_print(f"Found flag: {exp} = {ONREFRESH_FLAGS[i]}")
-            found_flags.append(ONREFRESH_FLAGS[i])
-            n -= exp
-    
-    return found_flags
+def _script_relative_path(path):
+    """Resolve a relative path next to the script."""
+    if os.path.isabs(path):
+        return path
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
 
 
 def _update_time_signature():
     """Query and store current time signature and tempo."""
+    global ticks_per_step
+    
     timebase = general.getRecPPQ()
+    ticks_per_step = max(1, timebase // 4)
     time_signature = general.getRecPPB()
     tempo = mixer.getCurrentTempo() / 1000
     
-    debug_print(f'Tempo: {tempo}')
-    debug_print(f'Time signature: {timebase}, {time_signature}')
+    log_time_signature('Tempo: %s', tempo)
+    log_time_signature('Time signature: %s, %s', timebase, time_signature)
 
 
 def clip(value, min_value, max_value):
@@ -866,8 +2653,16 @@ def wrap(value, min_value, max_value):
     return ((value - min_value) % range_size) + min_value
 
 
-def debug_print(message):
-    """Print debug message if debug flag is enabled for calling function."""
-    caller = inspect.currentframe().f_back.f_code.co_name
-    if DEBUG.get(caller, False):
-        print(f"[{caller}] {message}")
\ No newline at end of file
+# ============================================================================
+# REFRESH DISPATCH TABLE
+# ============================================================================
+refresh__register(FLAGS_PATTERNS, _on_refresh_patterns)
+refresh__register(REFRESH_ANY, _on_refresh_playback)
+refresh__register(FLAGS_PLUGINS, _on_refresh_plugins)
+refresh__register(HW_Dirty_Performance | HW_Dirty_Tracks, _on_refresh_clips)
+refresh__register(HW_Dirty_ControlValues | HW_Dirty_RemoteLinkValues, _on_refresh_control_values)
+
+if TRACE:
+    trace__install()
+if PROFILE:
+    profile__install()
@@ -0,0 +1,35 @@
+# name=AKAI APC mini link
+# receiveFrom=AKAI APC mini Proto Ale
+# url=https://www.akaipro.com/apc-mini
+
+# Companion script for the extra units of device_APCmini_layers_new_navigation.py
+# (see UNITS there). It holds no state of its own: pad and fader input goes
+# to the main script on this unit's MIDI channel, and LED messages the main
+# script dispatches on channel 16 are sent to this controller.
+
+import device
+
+LINK_CHANNEL = 15  # MIDI channel of messages from the main script
+LINK_HELLO_CC = 127  # CC telling this script its unit number
+
+unit = 1  # Set by the main script's hello when it starts
+
+
+def OnInit():
+    """Called when the script is loaded."""
+    print("APC mini link initialized")
+
+
+def OnMidiMsg(event):
+    """Forward hardware input to the main script, and main script output to the hardware."""
+    global unit
+
+    event.handled = True
+    status = event.status & 0xF0
+    if event.status & 0x0F == LINK_CHANNEL:
+        if status == 0xB0 and event.data1 == LINK_HELLO_CC:
+            unit = event.data2
+        else:
+            device.midiOutMsg(status, 0, event.data1, event.data2)
+    elif device.dispatchReceiverCount() > 0:
+        device.dispatch(0, status + unit + (event.data1 << 8) + (event.data2 << 16))
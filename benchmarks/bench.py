@@ -0,0 +1,522 @@
+"""Offline benchmarks for the APC mini script.
+
+Runs the script against the simulated FL Studio API in fl_sim/ and reports
+wall time, FL API calls and MIDI messages per callback for a set of
+scenarios. Exits with status 1 when an API call or MIDI message count
+regresses past baseline.json.
+
+    python benchmarks/bench.py                    # run all scenarios
+    python benchmarks/bench.py beats_1h           # run selected scenarios
+    python benchmarks/bench.py --update-baseline  # store current numbers
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPT_PATH = os.path.join(BENCH_DIR, os.pardir, "Akai APC Mini", "device_APCmini_layers_new_navigation.py")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+
+sys.path.insert(0, os.path.join(BENCH_DIR, "fl_sim"))
+import simstate  # noqa: E402
+
+IDLE_INTERVAL = 0.02  # FL calls OnIdle roughly every 20 ms
+COUNT_TOLERANCE = 0.05  # Allowed growth of API/MIDI counts over the baseline
+TIME_TOLERANCE = 0.5  # Allowed growth of wall time with --check-time
+
+NOTE_ON = 144
+NOTE_OFF = 128
+CC = 176
+BT_STATE = 87
+BT_LEFT = 66
+BT_UP = 64
+BT_DOWN = 65
+BT_RIGHT = 67
+
+
+class SimClock:
+    """Stands in for the script's time module.
+
+    Simulated time only moves when the harness advances it, plus the real
+    time spent inside the current callback, so per-tick time budgets in the
+    script still behave.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self._real_start = time.perf_counter()
+
+    def advance(self, seconds):
+        self.now += seconds
+        self._real_start = time.perf_counter()
+
+    def perf_counter(self):
+        return self.now + (time.perf_counter() - self._real_start)
+
+    def time(self):
+        return self.perf_counter()
+
+
+def load_script(clock, **constants):
+    """Import a fresh copy of the script with debug output disabled.
+
+    constants replace the values of top-level settings (e.g. UNITS=2) before
+    the script runs, so values derived from them follow.
+    """
+    spec = importlib.util.spec_from_file_location("apc_script", SCRIPT_PATH)
+    script = importlib.util.module_from_spec(spec)
+    with open(SCRIPT_PATH) as f:
+        source = f.read()
+    for name, value in constants.items():
+        source, found = re.subn(rf"^{name} = .*$", f"{name} = {value!r}", source, count=1, flags=re.M)
+        if not found:
+            raise KeyError(f"{name} is not a top-level setting of the script")
+    exec(compile(source, SCRIPT_PATH, "exec"), vars(script))
+    script.time = clock
+    script.DESCRIPTOR_CACHE_PATH = None  # Scenarios start cold unless they set a path
+    for value in vars(script).values():
+        if isinstance(value, script.DebugLog):
+            value.on = False
+    return script
+
+
+class Harness:
+    """Drives the script's callbacks and accounts their cost."""
+
+    def __init__(self, project, **constants):
+        simstate.reset(project)
+        self.clock = SimClock()
+        self.script = load_script(self.clock, **constants)
+        self.stats = {}  # callback -> [calls, seconds, max seconds, api calls, midi messages]
+        self.wall = 0.0
+
+    def call(self, name, *args):
+        callback = getattr(self.script, name)
+        api_before = simstate.totals["calls"]
+        midi_before = simstate.totals["midi"]
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = callback(*args)
+        elapsed = time.perf_counter() - start
+        midi = simstate.totals["midi"] - midi_before
+        stats = self.stats.setdefault(name, [0, 0.0, 0.0, 0, 0])
+        stats[0] += 1
+        stats[1] += elapsed
+        stats[2] = max(stats[2], elapsed)
+        stats[3] += simstate.totals["calls"] - api_before - midi
+        stats[4] += midi
+        self.wall += elapsed
+        return result
+
+    def idle(self, seconds):
+        """Advance simulated time, calling OnIdle every IDLE_INTERVAL."""
+        for _ in range(max(1, round(seconds / IDLE_INTERVAL))):
+            self.clock.advance(IDLE_INTERVAL)
+            self.call("OnIdle")
+
+    def midi(self, status, data1, data2):
+        self.call("OnMidiMsg", simstate.MidiEvent(status, data1, data2))
+
+    def press(self, note):
+        self.midi(NOTE_ON, note, 127)
+        self.midi(NOTE_OFF, note, 0)
+
+    def refresh(self, flags, burst=1):
+        for _ in range(burst):
+            self.call("OnRefresh", flags)
+
+    def goto_state(self, name):
+        while self.script.STATES[self.script.current_state_index] != name:
+            self.press(BT_STATE)
+        self.idle(0.2)
+
+    def result(self):
+        api = sum(stats[3] for stats in self.stats.values())
+        midi = sum(stats[4] for stats in self.stats.values())
+        return {"wall_ms": round(self.wall * 1000, 2), "api_calls": api, "midi_out": midi}
+
+
+def _random_steps(project, density, seed):
+    rng = random.Random(seed)
+    for pattern, length in project.pattern_lengths.items():
+        for channel in range(len(project.channel_names)):
+            for step in range(length):
+                if rng.random() < density:
+                    project.set_step(channel, step, 1, pattern)
+
+
+# ============================================================================
+# SCENARIOS
+# ============================================================================
+
+def scenario_pattern_64x64():
+    """64 channels x 64 steps: enter PATTERNS, edit, page, refresh bursts."""
+    project = simstate.Project(n_channels=64, pattern_length=64)
+    _random_steps(project, 0.25, seed=1)
+    harness = Harness(project)
+    harness.call("OnInit")
+    harness.goto_state("PATTERNS")
+    harness.idle(1.0)
+
+    for note in range(16, 64, 3):
+        harness.press(note)
+    for page in range(8):
+        harness.press(page)
+    for _ in range(10):
+        harness.refresh(1024, burst=5)
+        harness.idle(0.1)
+    return harness
+
+
+def scenario_pattern_switching():
+    """16 patterns of 32 channels x 64 steps, switched back and forth in PATTERNS."""
+    project = simstate.Project(n_channels=32, n_patterns=16, pattern_length=64)
+    _random_steps(project, 0.25, seed=2)
+    harness = Harness(project)
+    harness.call("OnInit")
+    harness.goto_state("PATTERNS")
+    harness.idle(1.0)
+
+    for _ in range(4):
+        for pattern in (1, 2, 3, 4, 3, 2):
+            project.current_pattern = pattern
+            harness.refresh(1024)
+            harness.idle(0.3)
+    return harness
+
+
+def scenario_channel_scroll_100():
+    """100 channels x 64 steps: scroll the PATTERNS window down and back up."""
+    project = simstate.Project(n_channels=100, pattern_length=64)
+    _random_steps(project, 0.25, seed=3)
+    harness = Harness(project)
+    harness.call("OnInit")
+    harness.goto_state("PATTERNS")
+    harness.idle(0.5)
+
+    for button in [BT_DOWN] * 8 + [BT_UP] * 8:
+        harness.press(button)
+        harness.idle(0.1)
+    return harness
+
+
+def scenario_rack_125_heavy():
+    """125 mixer tracks with heavy plugins: enter PLUGINS, tweak, refresh."""
+    project = simstate.Project(n_tracks=125)
+    for track in range(125):
+        for slot in range(3):
+            n_params = 4000 if (track % 10 == 0 and slot == 0) else 500
+            project.plugins[(track, slot)] = simstate.Plugin(
+                f"Plugin {slot}", [(f"Param {par}", 0.5) for par in range(n_params)])
+    harness = Harness(project)
+    harness.call("OnInit")
+    harness.goto_state("PLUGINS")
+
+    harness.press(56)  # Track 0, slot 0
+    for _ in range(10):
+        harness.press(48)  # + on parameter 0
+        harness.press(40)  # - on parameter 0
+    for _ in range(5):
+        harness.press(BT_DOWN)
+    harness.press(BT_LEFT)
+    harness.idle(0.2)
+    for _ in range(5):
+        harness.refresh(8192 | 16384, burst=4)
+        harness.idle(0.1)
+    return harness
+
+
+def scenario_rack_shared_plugins():
+    """40 tracks with the same synth: open it on each visible track and page parameters."""
+    project = simstate.Project(n_tracks=40)
+    for track in range(40):
+        project.plugins[(track, 0)] = simstate.Plugin(
+            "Synth", [(f"Param {par}", 0.5) for par in range(500)])
+    harness = Harness(project)
+    harness.call("OnInit")
+    harness.goto_state("PLUGINS")
+    harness.idle(0.2)
+
+    for page in range(5):
+        for row in range(4):
+            harness.press(56 - 16 * row)  # Slot 0 of the track on this row
+            for _ in range(3):
+                harness.press(BT_DOWN)
+                harness.press(48)  # + on the first parameter of the page
+            harness.press(BT_LEFT)
+            harness.idle(0.2)
+        harness.press(BT_DOWN)
+        harness.idle(0.1)
+    return harness
+
+
+def scenario_rack_warm_descriptors():
+    """Open 30 different plugins in a session started with a saved descriptor cache."""
+    def session(cache_path):
+        project = simstate.Project(n_tracks=30)
+        for track in range(30):
+            project.plugins[(track, 0)] = simstate.Plugin(
+                f"Plugin {track}", [(f"Param {par}", 0.5) for par in range(300)])
+        harness = Harness(project)
+        harness.script.DESCRIPTOR_CACHE_PATH = cache_path
+        harness.call("OnInit")
+        harness.goto_state("PLUGINS")
+        harness.idle(0.2)
+        for page in range(8):
+            for row in range(4):
+                harness.press(56 - 16 * row)  # Slot 0 of the track on this row
+                harness.press(BT_DOWN)
+                harness.press(BT_LEFT)
+            harness.press(BT_DOWN)
+            harness.idle(0.1)
+        harness.call("OnDeInit")
+        return harness
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache_path = os.path.join(cache_dir, "descriptors.json")
+        session(cache_path)  # Cold session fills the cache
+        return session(cache_path)
+
+
+def scenario_param_hold_repeat():
+    """Tap and hold +/- pads of an open plugin under a stream of control-value refreshes."""
+    project = simstate.Project(n_tracks=4)
+    project.plugins[(0, 0)] = simstate.Plugin("Synth", [(f"Param {par}", 0.5) for par in range(64)])
+    harness = Harness(project)
+    harness.call("OnInit")
+    harness.goto_state("PLUGINS")
+    harness.press(56)  # Track 0, slot 0
+
+    for par in range(8):
+        for _ in range(5):
+            harness.press(48 + par)  # + taps
+            harness.refresh(4096)
+            harness.idle(0.02)
+        harness.midi(NOTE_ON, 40 + par, 127)  # Hold -
+        for _ in range(50):
+            harness.refresh(4096)
+            harness.idle(0.02)
+        harness.midi(NOTE_OFF, 40 + par, 0)
+        harness.idle(0.1)
+    return harness
+
+
+def scenario_state_cycling():
+    """Cycle through all layers repeatedly, with an occasional pattern edit in FL."""
+    project = simstate.Project(n_channels=32, pattern_length=64, n_tracks=40)
+    _random_steps(project, 0.25, seed=4)
+    for track in range(40):
+        project.plugins[(track, 0)] = simstate.Plugin("Synth", [("Cutoff", 0.5)])
+    harness = Harness(project)
+    harness.call("OnInit")
+    harness.idle(0.2)
+
+    for cycle in range(12):
+        for _ in range(len(harness.script.STATES)):
+            harness.press(BT_STATE)
+            harness.idle(0.2)
+        if cycle % 4 == 3:
+            project.set_step(0, 0, 1)
+            harness.refresh(1024)
+            harness.idle(0.1)
+    return harness
+
+
+def _play(harness, project, seconds):
+    """Start playback and drive beat indicators and OnIdle for seconds."""
+    project.playing = True
+    harness.refresh(256)
+
+    ticks_per_second = project.ppq * project.tempo / 60
+    tick_step = ticks_per_second * IDLE_INTERVAL
+    song_pos = 0.0
+    beat = -1
+    for _ in range(round(seconds / IDLE_INTERVAL)):
+        song_pos += tick_step
+        project.song_pos = int(song_pos)
+        half_beats = int(song_pos // (project.ppq / 2))
+        if half_beats != beat:
+            beat = half_beats
+            if beat % 2:
+                harness.call("OnUpdateBeatIndicator", 0)
+            else:
+                harness.call("OnUpdateBeatIndicator", 1 if beat % 8 == 0 else 2)
+        harness.clock.advance(IDLE_INTERVAL)
+        harness.call("OnIdle")
+
+
+def scenario_clip_launcher():
+    """200 playlist tracks x 64 live blocks: scroll the CLIPS grid and launch clips."""
+    project = simstate.Project()
+    project.playlist_tracks = 200
+    rng = random.Random(5)
+    for track in range(1, project.playlist_tracks + 1):
+        project.live_blocks[track] = {block: 1 for block in range(64) if rng.random() < 0.3}
+    harness = Harness(project)
+    harness.call("OnInit")
+    harness.goto_state("CLIPS")
+
+    for _ in range(3):
+        for button in [BT_DOWN] * 10 + [BT_RIGHT] * 3 + [BT_UP] * 10 + [BT_LEFT] * 3:
+            harness.press(button)
+            harness.idle(0.02)
+        for pad in range(0, 64, 9):
+            harness.press(pad)
+            harness.call("OnUpdateLiveMode", 8)  # FL reports the launch
+            harness.idle(0.04)
+    harness.refresh(64)  # Performance layout change
+    harness.idle(0.1)
+    return harness
+
+
+def scenario_beats_1h():
+    """One hour of playback at 120 BPM in PATTERNS state."""
+    project = simstate.Project(n_channels=16, pattern_length=16)
+    _random_steps(project, 0.3, seed=2)
+    harness = Harness(project)
+    harness.call("OnInit")
+    harness.goto_state("PATTERNS")
+
+    _play(harness, project, 3600)
+    return harness
+
+
+def scenario_beats_1h_two_units():
+    """One hour of playback of a 32-step pattern across two linked APC minis."""
+    project = simstate.Project(n_channels=16, pattern_length=32)
+    _random_steps(project, 0.3, seed=2)
+    harness = Harness(project, UNITS=2)
+    harness.call("OnInit")
+    harness.goto_state("PATTERNS")
+    harness.midi(NOTE_ON + 1, 20, 127)  # A pad on the linked unit
+    harness.midi(NOTE_OFF + 1, 20, 0)
+
+    _play(harness, project, 3600)
+    return harness
+
+
+def scenario_meters_playback():
+    """Ten minutes of METERS during playback, with peaks changing on every idle tick."""
+    project = simstate.Project(n_tracks=9)
+    harness = Harness(project)
+    harness.call("OnInit")
+    harness.goto_state("METERS")
+
+    rng = random.Random(7)
+    levels = [0.3] * len(project.track_peaks)
+    for _ in range(round(600 / IDLE_INTERVAL)):
+        for track in range(1, len(levels)):
+            levels[track] = min(1.2, max(0.0, levels[track] * rng.uniform(0.8, 1.2) + rng.uniform(-0.02, 0.02)))
+            project.track_peaks[track] = levels[track]
+        harness.clock.advance(IDLE_INTERVAL)
+        harness.call("OnIdle")
+    return harness
+
+
+def scenario_fader_sweeps():
+    """Sweep all eight faders up and down in each fader mode."""
+    project = simstate.Project(n_channels=16, n_tracks=16)
+    project.plugins[(0, 0)] = simstate.Plugin("Synth", [(f"Param {par}", 0.5) for par in range(64)])
+    harness = Harness(project)
+    harness.call("OnInit")
+    harness.goto_state("PLUGINS")
+    harness.press(56)  # Open track 0, slot 0 for DEVICE mode
+
+    for mode_button in (68, 69, 70, 71):
+        harness.press(mode_button)
+        for sweep in (range(0, 128), range(127, -1, -1)):
+            # The controller sends several CC messages per 20 ms idle tick
+            for value in sweep:
+                for fader in range(48, 56):
+                    harness.midi(CC, fader, value)
+                if value % 4 == 0:
+                    harness.idle(IDLE_INTERVAL)
+    return harness
+
+
+SCENARIOS = {
+    "pattern_64x64": scenario_pattern_64x64,
+    "pattern_switching": scenario_pattern_switching,
+    "channel_scroll_100": scenario_channel_scroll_100,
+    "rack_125_heavy": scenario_rack_125_heavy,
+    "rack_shared_plugins": scenario_rack_shared_plugins,
+    "rack_warm_descriptors": scenario_rack_warm_descriptors,
+    "param_hold_repeat": scenario_param_hold_repeat,
+    "state_cycling": scenario_state_cycling,
+    "clip_launcher": scenario_clip_launcher,
+    "beats_1h": scenario_beats_1h,
+    "beats_1h_two_units": scenario_beats_1h_two_units,
+    "meters_playback": scenario_meters_playback,
+    "fader_sweeps": scenario_fader_sweeps,
+}
+
+
+# ============================================================================
+# REPORTING
+# ============================================================================
+
+def report(name, harness):
+    result = harness.result()
+    print(f"{name}: wall {result['wall_ms']:.1f} ms, "
+          f"FL API calls {result['api_calls']}, MIDI out {result['midi_out']}")
+    print(f"  {'callback':<24}{'calls':>9}{'avg ms':>10}{'max ms':>10}{'api/call':>10}{'midi/call':>11}")
+    for callback, (calls, seconds, max_seconds, api, midi) in sorted(harness.stats.items()):
+        print(f"  {callback:<24}{calls:>9}{seconds * 1000 / calls:>10.3f}"
+              f"{max_seconds * 1000:>10.3f}{api / calls:>10.2f}{midi / calls:>11.2f}")
+    return result
+
+
+def check(name, result, baseline, check_time):
+    """Return a list of regressions of result against the baseline entry."""
+    failures = []
+    for key, tolerance in (("api_calls", COUNT_TOLERANCE), ("midi_out", COUNT_TOLERANCE),
+                           ("wall_ms", TIME_TOLERANCE)):
+        if key == "wall_ms" and not check_time:
+            continue
+        if key in baseline and result[key] > baseline[key] * (1 + tolerance):
+            failures.append(f"{name}: {key} {result[key]} > baseline {baseline[key]}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scenarios", nargs="*", metavar="scenario", help=", ".join(SCENARIOS))
+    parser.add_argument("--update-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--check-time", action="store_true", help="also fail on wall time regressions")
+    args = parser.parse_args(argv)
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error(f"unknown scenario {name!r}")
+
+    baselines = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baselines = json.load(f)
+
+    failures = []
+    for name in args.scenarios or list(SCENARIOS):
+        result = report(name, SCENARIOS[name]())
+        if args.update_baseline:
+            baselines[name] = result
+        else:
+            failures += check(name, result, baselines.get(name, {}), args.check_time)
+
+    if args.update_baseline:
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""Simulated FL Studio channels module."""
+import simstate
+
+
+def channelCount(globalCount=False):
+    simstate.record("channels.channelCount")
+    return len(simstate.project.channel_names)
+
+
+def getChannelName(index, useGlobalIndex=False):
+    simstate.record("channels.getChannelName")
+    return simstate.project.channel_names[index]
+
+
+def getGridBit(index, position, useGlobalIndex=False):
+    simstate.record("channels.getGridBit")
+    project = simstate.project
+    return int(position in project.pattern_steps[project.current_pattern].get(index, ()))
+
+
+def setGridBit(index, position, value, useGlobalIndex=False):
+    simstate.record("channels.setGridBit")
+    simstate.project.set_step(index, position, value)
+
+
+def getChannelVolume(index, mode=0, useGlobalIndex=False):
+    simstate.record("channels.getChannelVolume")
+    return simstate.project.channel_volumes[index]
+
+
+def setChannelVolume(index, volume, pickupMode=0, useGlobalIndex=False):
+    simstate.record("channels.setChannelVolume")
+    simstate.project.channel_volumes[index] = volume
+
+
+def getChannelPan(index, useGlobalIndex=False):
+    simstate.record("channels.getChannelPan")
+    return simstate.project.channel_pans[index]
+
+
+def setChannelPan(index, pan, pickupMode=0, useGlobalIndex=False):
+    simstate.record("channels.setChannelPan")
+    simstate.project.channel_pans[index] = pan
+
+
+def selectedChannel(canBeNone=False, offset=0, indexGlobal=False):
+    simstate.record("channels.selectedChannel")
+    return 0
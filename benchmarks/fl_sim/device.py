@@ -0,0 +1,29 @@
+"""Simulated FL Studio device module."""
+import simstate
+
+
+def midiOutMsg(message, channel=None, data1=None, data2=None):
+    simstate.record("device.midiOutMsg")
+    simstate.totals["midi"] += 1
+    if channel is None:
+        status, data1, data2 = message & 0xFF, (message >> 8) & 0xFF, (message >> 16) & 0xFF
+    else:
+        status = message + channel
+    simstate.midi_out.append((status, data1, data2))
+
+
+def isAssigned():
+    simstate.record("device.isAssigned")
+    return True
+
+
+def dispatch(receiver, message):
+    simstate.record("device.dispatch")
+    simstate.totals["midi"] += 1
+    status, data1, data2 = message & 0xFF, (message >> 8) & 0xFF, (message >> 16) & 0xFF
+    simstate.midi_out.append((receiver, status, data1, data2))
+
+
+def dispatchReceiverCount():
+    simstate.record("device.dispatchReceiverCount")
+    return 1
@@ -0,0 +1,12 @@
+"""Simulated FL Studio general module."""
+import simstate
+
+
+def getRecPPQ():
+    simstate.record("general.getRecPPQ")
+    return simstate.project.ppq
+
+
+def getRecPPB():
+    simstate.record("general.getRecPPB")
+    return simstate.project.ppq * 4
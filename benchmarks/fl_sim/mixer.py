@@ -0,0 +1,38 @@
+"""Simulated FL Studio mixer module."""
+import simstate
+
+
+def trackCount():
+    simstate.record("mixer.trackCount")
+    return len(simstate.project.track_names)
+
+
+def getTrackName(index):
+    simstate.record("mixer.getTrackName")
+    return simstate.project.track_names[index]
+
+
+def isTrackPluginValid(index, plugIndex):
+    simstate.record("mixer.isTrackPluginValid")
+    return (index, plugIndex) in simstate.project.plugins
+
+
+def getTrackVolume(index, mode=0):
+    simstate.record("mixer.getTrackVolume")
+    return simstate.project.track_volumes[index]
+
+
+def setTrackVolume(index, volume, pickupMode=0):
+    simstate.record("mixer.setTrackVolume")
+    simstate.project.track_volumes[index] = volume
+
+
+def getTrackPeaks(index, mode):
+    simstate.record("mixer.getTrackPeaks")
+    peaks = simstate.project.track_peaks
+    return peaks[index] if index < len(peaks) else 0.0  # FL always has 125 inserts
+
+
+def getCurrentTempo(asInt=False):
+    simstate.record("mixer.getCurrentTempo")
+    return int(simstate.project.tempo * 1000)
@@ -0,0 +1,27 @@
+"""Simulated FL Studio patterns module."""
+import simstate
+
+
+def patternNumber():
+    simstate.record("patterns.patternNumber")
+    return simstate.project.current_pattern
+
+
+def patternCount():
+    simstate.record("patterns.patternCount")
+    return len(simstate.project.pattern_lengths)
+
+
+def getPatternLength(index):
+    simstate.record("patterns.getPatternLength")
+    return simstate.project.pattern_lengths.get(index, 16)
+
+
+def getPatternName(index):
+    simstate.record("patterns.getPatternName")
+    return f"Pattern {index}"
+
+
+def jumpToPattern(index):
+    simstate.record("patterns.jumpToPattern")
+    simstate.project.current_pattern = index
@@ -0,0 +1,22 @@
+"""Simulated FL Studio playlist module."""
+import simstate
+
+
+def trackCount():
+    simstate.record("playlist.trackCount")
+    return simstate.project.playlist_tracks
+
+
+def getLiveBlockStatus(index, blockNum, mode=0):
+    simstate.record("playlist.getLiveBlockStatus")
+    return simstate.project.live_blocks.get(index, {}).get(blockNum, 0)
+
+
+def triggerLiveClip(index, subNum, flags, velocity=-1):
+    simstate.record("playlist.triggerLiveClip")
+    blocks = simstate.project.live_blocks.get(index, {})
+    for block, status in blocks.items():
+        if status == 2:
+            blocks[block] = 1
+    if blocks.get(subNum):
+        blocks[subNum] = 2
@@ -0,0 +1,36 @@
+"""Simulated FL Studio plugins module."""
+import simstate
+
+
+def _plugin(index, slotIndex):
+    return simstate.project.plugins[(index, slotIndex)]
+
+
+def isValid(index, slotIndex=-1, useGlobalIndex=False):
+    simstate.record("plugins.isValid")
+    return (index, slotIndex) in simstate.project.plugins
+
+
+def getPluginName(index, slotIndex=-1, userName=False, useGlobalIndex=False):
+    simstate.record("plugins.getPluginName")
+    return _plugin(index, slotIndex).name
+
+
+def getParamCount(index, slotIndex=-1, useGlobalIndex=False):
+    simstate.record("plugins.getParamCount")
+    return len(_plugin(index, slotIndex).params)
+
+
+def getParamName(paramIndex, index, slotIndex=-1, useGlobalIndex=False):
+    simstate.record("plugins.getParamName")
+    return _plugin(index, slotIndex).params[paramIndex][0]
+
+
+def getParamValue(paramIndex, index, slotIndex=-1, useGlobalIndex=False):
+    simstate.record("plugins.getParamValue")
+    return _plugin(index, slotIndex).params[paramIndex][1]
+
+
+def setParamValue(value, paramIndex, index, slotIndex=-1, pickupMode=0, useGlobalIndex=False):
+    simstate.record("plugins.setParamValue")
+    _plugin(index, slotIndex).params[paramIndex][1] = value
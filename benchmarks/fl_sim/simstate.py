@@ -0,0 +1,89 @@
+"""Shared state of the simulated FL Studio API.
+
+The modules in this directory (device, channels, patterns, ...) stand in
+for the ones FL Studio provides to MIDI scripts. They read and write the
+Project held here and record every call, so a script can be driven and
+measured outside FL Studio.
+"""
+
+
+class Plugin:
+    """A plugin instance in a mixer slot."""
+
+    def __init__(self, name, params):
+        self.name = name
+        self.params = [[par_name, value] for par_name, value in params]
+
+
+class Project:
+    """Configurable contents of the simulated FL Studio project."""
+
+    def __init__(self, n_channels=8, n_patterns=1, pattern_length=16, n_tracks=8, ppq=96):
+        self.channel_names = [f"Channel {idx}" for idx in range(n_channels)]
+        self.channel_volumes = [0.78] * n_channels
+        self.channel_pans = [0.0] * n_channels
+
+        # Pattern numbers start at 1, as in FL Studio
+        self.pattern_lengths = {num: pattern_length for num in range(1, n_patterns + 1)}
+        self.pattern_steps = {num: {} for num in range(1, n_patterns + 1)}  # channel -> set of steps
+        self.current_pattern = 1
+
+        self.track_names = ["Master"] + [f"Insert {idx}" for idx in range(1, n_tracks)]
+        self.track_volumes = [0.8] * n_tracks
+        self.track_peaks = [0.0] * n_tracks
+        self.plugins = {}  # (track, slot) -> Plugin
+
+        # Playlist tracks start at 1, as in FL Studio
+        self.playlist_tracks = 500
+        self.live_blocks = {}  # playlist track -> {live block: status}, 1 filled, 2 playing
+
+        self.ppq = ppq
+        self.tempo = 120.0
+        self.playing = False
+        self.song_pos = 0  # Absolute ticks
+
+    def set_step(self, channel, step, value=1, pattern=None):
+        """Switch a step of a pattern (default: the current one) on or off."""
+        steps = self.pattern_steps[pattern or self.current_pattern].setdefault(channel, set())
+        if value:
+            steps.add(step)
+        else:
+            steps.discard(step)
+
+
+class MidiEvent:
+    """Minimal stand-in for the event object passed to OnMidiMsg."""
+
+    def __init__(self, status, data1, data2):
+        self.status = status
+        self.data1 = data1
+        self.data2 = data2
+        self.midiId = status & 0xF0
+        self.midiChan = status & 0x0F
+        self.handled = False
+
+
+project = Project()
+calls = {}  # "module.function" -> call count
+midi_out = []  # (status, data1, data2) from device.midiOutMsg, (receiver, status, data1, data2) from device.dispatch
+hints = []  # Messages passed to ui.setHintMsg
+totals = {"calls": 0, "midi": 0}
+
+
+def record(name):
+    """Count a call to the simulated API."""
+    calls[name] = calls.get(name, 0) + 1
+    totals["calls"] += 1
+
+
+def reset(new_project=None):
+    """Clear recorded calls and output and optionally install a new project."""
+    global project
+
+    if new_project is not None:
+        project = new_project
+    calls.clear()
+    del midi_out[:]
+    del hints[:]
+    totals["calls"] = 0
+    totals["midi"] = 0
@@ -0,0 +1,28 @@
+"""Simulated FL Studio transport module."""
+import simstate
+
+
+def isPlaying():
+    simstate.record("transport.isPlaying")
+    return int(simstate.project.playing)
+
+
+def start():
+    simstate.record("transport.start")
+    simstate.project.playing = not simstate.project.playing
+
+
+def stop():
+    simstate.record("transport.stop")
+    simstate.project.playing = False
+    simstate.project.song_pos = 0
+
+
+def getSongPos(mode=-1):
+    simstate.record("transport.getSongPos")
+    return simstate.project.song_pos
+
+
+def getLoopMode():
+    simstate.record("transport.getLoopMode")
+    return 0
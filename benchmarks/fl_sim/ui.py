@@ -0,0 +1,7 @@
+"""Simulated FL Studio ui module."""
+import simstate
+
+
+def setHintMsg(msg):
+    simstate.record("ui.setHintMsg")
+    simstate.hints.append(msg)
@@ -0,0 +1,172 @@
+"""Replay a trace recorded by the APC mini script.
+
+Set TRACE = True in the script to record one (see its TRACE RECORDING
+section). The recorded callbacks are fed back through the current script
+against the simulated FL Studio API in fl_sim/. FL API calls return the
+values recorded for the same callback, in order. Calls the recording has
+no value for (writes, or calls a newer script makes) fall back to the
+simulation. Reports wall time, FL API calls
+and MIDI output like bench.py, plus a digest of the MIDI output.
+
+    python benchmarks/replay.py apcmini_trace.bin                   # maximum speed
+    python benchmarks/replay.py apcmini_trace.bin --realtime        # original timing
+    python benchmarks/replay.py apcmini_trace.bin --output run.json
+    python benchmarks/replay.py apcmini_trace.bin --compare run.json
+"""
+import argparse
+import collections
+import hashlib
+import json
+import struct
+import sys
+import time
+
+import bench
+from bench import Harness, simstate
+
+
+class TraceReader:
+    """Iterates over the callbacks of a trace with the FL values each observed."""
+
+    def __init__(self, path, script):
+        with open(path, "rb") as f:
+            self.data = f.read()
+        if self.data[:4] != b"APCT":
+            raise ValueError(f"{path} is not an APC mini trace")
+        version, = struct.unpack_from("<H", self.data, 4)
+        if version != script.TRACE_VERSION:
+            raise ValueError(f"{path} has trace version {version}, the script reads {script.TRACE_VERSION}")
+        self.script = script
+        self.callbacks = {kind: (name, fmt) for name, (kind, fmt) in script.TRACE_CALLBACKS.items()}
+        self.value_formats = {tag: fmt for _, tag, fmt in script.TRACE_VALUE_FORMATS}
+
+    def __iter__(self):
+        """Yield (seconds since the previous callback, callback name, args, returns).
+
+        returns maps "module.function" to a deque of the values it returned
+        during the callback.
+        """
+        data = self.data
+        offset = 6
+        names = {}
+        pending = None
+        elapsed = 0.0
+        while offset < len(data):
+            kind, delta = struct.unpack_from("<BI", data, offset)
+            offset += 5
+            elapsed += delta / 1000000
+            if kind == self.script.TRACE_NAME:
+                function_id, length = struct.unpack_from("<HB", data, offset)
+                offset += 3
+                names[function_id] = data[offset:offset + length].decode()
+                offset += length
+            elif kind == self.script.TRACE_RETURN:
+                function_id, tag = struct.unpack_from("<HB", data, offset)
+                offset += 3
+                fmt = "<" + self.value_formats[tag]
+                value, = struct.unpack_from(fmt, data, offset)
+                offset += struct.calcsize(fmt)
+                if tag == 4:
+                    length = value
+                    value = data[offset:offset + length].decode()
+                    offset += length
+                if pending is not None:
+                    pending[3][names[function_id]].append(value)
+            else:
+                if pending is not None:
+                    yield pending
+                name, fmt = self.callbacks[kind]
+                args = struct.unpack_from("<" + fmt, data, offset)
+                offset += struct.calcsize("<" + fmt)
+                pending = (elapsed, name, args, collections.defaultdict(collections.deque))
+                elapsed = 0.0
+        if pending is not None:
+            yield pending
+
+
+class ReplayModule:
+    """Stands in for an FL module, answering calls with recorded values first."""
+
+    def __init__(self, module, module_name, returns):
+        self._module = module
+        self._module_name = module_name
+        self._returns = returns
+
+    def __getattr__(self, name):
+        attr = getattr(self._module, name)
+        if callable(attr):
+            attr = self._replaying(attr, f"{self._module_name}.{name}")
+            setattr(self, name, attr)
+        return attr
+
+    def _replaying(self, func, name):
+        def wrapper(*args, **kwargs):
+            recorded = self._returns[0].get(name)
+            if recorded:
+                simstate.record(name)
+                return recorded.popleft()
+            try:
+                return func(*args, **kwargs)
+            except LookupError:
+                return None  # Writes to objects the empty simulated project lacks
+        return wrapper
+
+
+def replay(path, realtime=False):
+    """Run a trace through the script and return the harness."""
+    harness = Harness(simstate.Project())
+    script = harness.script
+    if script.TRACE:
+        raise SystemExit("Set TRACE = False in the script before replaying, or it records over the trace")
+
+    returns = [{}]  # Values recorded for the callback being replayed
+    for module_name in script.FL_MODULE_NAMES:
+        setattr(script, module_name, ReplayModule(getattr(script, module_name), module_name, returns))
+
+    start = time.perf_counter()
+    trace_time = 0.0
+    for delta, name, args, recorded in TraceReader(path, script):
+        trace_time += delta
+        harness.clock.advance(delta)
+        if realtime:
+            time.sleep(max(0.0, start + trace_time - time.perf_counter()))
+        returns[0] = recorded
+        if name == "OnMidiMsg":
+            harness.midi(*args)
+        else:
+            harness.call(name, *args)
+    return harness
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("trace", help="trace file written with TRACE = True")
+    parser.add_argument("--realtime", action="store_true", help="keep the recorded timing between callbacks")
+    parser.add_argument("--output", metavar="FILE", help="store the results as JSON")
+    parser.add_argument("--compare", metavar="FILE", help="fail on MIDI differences or count regressions against FILE")
+    args = parser.parse_args(argv)
+
+    harness = replay(args.trace, args.realtime)
+    result = bench.report(args.trace, harness)
+    result["midi_digest"] = hashlib.sha1(repr(simstate.midi_out).encode()).hexdigest()
+    print(f"MIDI output digest {result['midi_digest']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    failures = []
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        failures = bench.check(args.trace, result, previous, check_time=False)
+        if previous.get("midi_digest") != result["midi_digest"]:
+            failures.append(f"{args.trace}: MIDI output differs from {args.compare}")
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())